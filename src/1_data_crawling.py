@@ -4,19 +4,41 @@ Script Crawling Berita v8.4 - Test Mode (1 Article per Keyword)
 """
 
 import pandas as pd
+import numpy as np
 import time
 import os
 import logging
 from newspaper import Article, Config
 import nltk
 import random
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from functools import wraps
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple, Callable, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, Future, as_completed, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
 import hashlib
+import json
+import sqlite3
+import re
+import zlib
+import heapq
+import statistics
+import gzip
+import base64
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode, urljoin, quote_plus
+import queue
+import socket
+import glob
+import requests
+from requests.adapters import HTTPAdapter
+from collections import Counter, defaultdict
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
 from tqdm import tqdm
 from pygooglenews import GoogleNews
+import feedparser
 
 # --- Import Selenium ---
 from selenium import webdriver
@@ -25,13 +47,20 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
+# --- psutil opsional, hanya untuk memantau RSS Chrome di DriverPool ---
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 # --- Setup Logging ---
 os.makedirs('data/logs', exist_ok=True)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('data/logs/crawler.log', mode='w'),
+        # Proses parser (spawn) mengimpor ulang skrip ini; jangan sampai log induk terpotong
+        logging.FileHandler('data/logs/crawler.log', mode='w' if multiprocessing.parent_process() is None else 'a'),
         logging.StreamHandler()
     ]
 )
@@ -60,14 +89,122 @@ BASE_DELAY = 3
 MAX_DELAY = 30
 NAMA_FILE_OUTPUT = "hasil_crawling_test"
 MAX_WORKERS = 3
-BATCH_SIZE = 10
+WORK_QUEUE_SIZE = 200
+PARSE_PROCESSES = 2  # 0 = parse di thread fetch (tanpa process pool)
+PARSE_START_METHOD = 'spawn'  # jangan fork dari proses yang sudah punya thread fetch/scout/resolve
+PARSE_QUEUE_SIZE = 8
 MAX_RETRIES = 3
 TIMEOUT = 30
 MIN_TEXT_LENGTH = 150
 ENABLE_JAVASCRIPT = True
 
+# --- Mode crawl terdistribusi: 'standalone' (default), 'coordinator' (scout + export) atau 'worker' (fetch) ---
+# Dapat diatur lewat environment agar skrip yang sama bisa dijalankan di banyak proses / mesin.
+CRAWL_MODE = os.environ.get('CRAWL_MODE', 'standalone')
+WORKER_ID = os.environ.get('CRAWL_WORKER_ID', f"{socket.gethostname()}-{os.getpid()}")
+SHARED_DIR = os.environ.get('CRAWL_SHARED_DIR', 'data')  # direktori bersama (mis. NFS) untuk frontier & checkpoint
+LEASE_SECONDS = 600  # lease URL kedaluwarsa bila worker mati, lalu URL bisa diambil worker lain
+LEASE_BATCH_SIZE = MAX_WORKERS * 4
+LEASE_POLL_SECONDS = 10
+
+# --- Checkpoint append-only (JSONL): tiap artikel valid ditulis sekali saat selesai diparse ---
+# Dalam mode worker, setiap worker menulis file checkpoint sendiri; export membaca semuanya.
+CHECKPOINT_PATH = os.path.join(SHARED_DIR, 'raw', f"{NAMA_FILE_OUTPUT}_checkpoint.jsonl")
+if CRAWL_MODE == 'worker':
+    CHECKPOINT_PATH = os.path.join(SHARED_DIR, 'raw', f"{NAMA_FILE_OUTPUT}_checkpoint.{WORKER_ID}.jsonl")
+RESUME_FROM_CHECKPOINT = True
+
+# --- Frontier URL persisten (SQLite): run berikutnya hanya fetch URL baru / yang layak dicoba ulang ---
+FRONTIER_PATH = os.path.join(SHARED_DIR, 'crawl_frontier.db')
+FRONTIER_MAX_ATTEMPTS = 3
+
+# --- Scheduler per-domain: konkurensi & jeda per portal, disesuaikan AIMD ---
+DOMAIN_INITIAL_CONCURRENCY = 1
+DOMAIN_MAX_CONCURRENCY = 3
+DOMAIN_MIN_DELAY = 1.0
+DOMAIN_TARGET_LATENCY = 10.0
+DOMAIN_INCREASE_STEP = 0.5
+
+# --- Statistik per-domain lintas run: pilih tier fetch termurah yang berhasil, lewati portal yang selalu gagal ---
+DOMAIN_STATS_PATH = os.path.join('data', 'domain_stats.db')
+DOMAIN_STATS_WINDOW = 50  # hanya N hasil terakhir per (domain, metode) yang dipakai
+DOMAIN_STATS_MIN_SAMPLES = 5
+DOMAIN_HTTP_MIN_SUCCESS = 0.2  # di bawah ini domain langsung dikirim ke Selenium
+DOMAIN_DEPRIORITIZE_BELOW = 0.3  # domain dengan success rate di bawah ini dijadwalkan paling akhir
+DOMAIN_SKIP_BELOW = 0.05  # di bawah ini hanya 1 URL per run yang dicoba (probe), sisanya dilewati
+DOMAIN_STATS_EXPLORE = 0.05  # peluang tetap mencoba HTTP agar statistik tier HTTP tetap segar
+
+# --- Cache HTML mentah (gzip, content-addressed) untuk reparse tanpa fetch ulang ---
+HTML_CACHE_DIR = os.path.join('data', 'html_cache')
+HTML_CACHE_MAX_MB = 2048
+REPARSE_FROM_CACHE = False  # True: bangun ulang dataset hanya dari cache, tanpa scouting/fetch
+
+# --- Resolusi URL kanonik (redirect Google News & <link rel=canonical>) sebelum fetch ---
+RESOLVE_CANONICAL_URLS = True
+RESOLVE_WORKERS = 16
+RESOLVE_CACHE_PATH = os.path.join('data', 'url_resolution.db')
+RESOLVE_NEGATIVE_TTL_HOURS = 72  # link yang gagal di-resolve tidak dicoba lagi selama ini
+RESOLVE_HEAD_BYTES = 65536  # awal halaman yang diperiksa untuk <link rel=canonical>
+RESOLVE_DRAIN_MAX_BYTES = 512 * 1024  # body sampai ukuran ini dibaca habis agar koneksi kembali ke pool
+
+# --- Deteksi near-duplicate (shingling + MinHash LSH) atas teks_berita ---
+NEAR_DUPLICATE_THRESHOLD = 0.8  # estimasi Jaccard; 0/None untuk menonaktifkan
+MINHASH_NUM_PERM = 128
+SHINGLE_SIZE = 5
+
+# --- Driver pool: driver dipakai ulang lalu di-recycle setelah N halaman / batas RSS ---
+DRIVER_MAX_PAGES = 50
+DRIVER_MAX_RSS_MB = 1024
+
+# --- Blokir resource berat di headless Chrome (DevTools Network.setBlockedURLs) ---
+BLOCK_RESOURCES = True
+BLOCKED_RESOURCE_TYPES = ['image', 'font', 'media', 'stylesheet']
+# Ekstensi dicocokkan di akhir path (atau sebelum '?'), bukan di mana saja dalam URL
+RESOURCE_TYPE_EXTENSIONS = {
+    'image': ['jpg', 'jpeg', 'png', 'gif', 'webp', 'svg', 'ico'],
+    'font': ['woff', 'woff2', 'ttf', 'otf', 'eot'],
+    'media': ['mp4', 'webm', 'm3u8', 'mp3'],
+    'stylesheet': ['css'],
+}
+BLOCKED_DOMAINS = [
+    'doubleclick.net', 'googlesyndication.com', 'googleadservices.com', 'google-analytics.com',
+    'googletagmanager.com', 'googletagservices.com', 'adnxs.com', 'criteo.com', 'taboola.com',
+    'outbrain.com', 'scorecardresearch.com', 'facebook.net', 'connect.facebook.com',
+    'platform.twitter.com', 'youtube.com/embed', 'ytimg.com', 'chartbeat.com', 'hotjar.com',
+    'amazon-adsystem.com', 'pubmatic.com', 'rubiconproject.com', 'onesignal.com',
+]
+# Mode ukur: tiap halaman dimuat dua kali (tanpa & dengan blokir) untuk menghitung byte/ms yang dihemat
+MEASURE_BLOCKING = False
+MEASURE_SETTLE_SECONDS = 2
+
+# --- Ekstraksi konten utama di dalam browser (execute_script), newspaper4k sebagai fallback ---
+IN_BROWSER_EXTRACTION = False  # catatan: halaman yang lolos ekstraksi ini tidak masuk HTML cache
+
+# --- Fetch bertingkat: coba HTTP biasa dulu, Selenium hanya jika validasi gagal ---
+ENABLE_HTTP_FIRST = True
+HTTP_TIMEOUT = 15
+HTTP_USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36")
+
 # --- PERUBAHAN: Tambahkan limit artikel per keyword ---
+# (dengan scouting ber-shard, limit ini berlaku per keyword per jendela tanggal)
 LIMIT_ARTICLES_PER_KEYWORD = 100
+
+# --- Scouting paralel per jendela tanggal ---
+SCOUT_WINDOW = 'month'  # 'week', 'month', atau None untuk satu query per keyword
+SCOUT_WORKERS = 4
+SCOUT_MIN_INTERVAL = BASE_DELAY / SCOUT_WORKERS  # jeda minimum antar request Google News (global)
+
+# --- Cache scouting (conditional GET dengan ETag/Last-Modified + hash body feed) ---
+ENABLE_SCOUT_CACHE = True
+SCOUT_CACHE_PATH = os.path.join('data', 'scout_cache.db')
+SCOUT_STABLE_AFTER_DAYS = 7  # jendela yang berakhir > N hari lalu dianggap stabil...
+SCOUT_STABLE_TTL_HOURS = 24  # ...dan hanya dicek ulang sekali per TTL ini
+
+# --- Metrik run: Prometheus textfile (node_exporter textfile collector) + laporan JSON per run ---
+METRICS_DIR = os.path.join('data', 'metrics')
+METRICS_RUN_NAME = WORKER_ID if CRAWL_MODE == 'worker' else CRAWL_MODE
+LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120)  # detik
 # ==============================================================================
 
 # Konfigurasi untuk newspaper4k
@@ -76,6 +213,128 @@ NP_CONFIG.fetch_images = False
 NP_CONFIG.memoize_articles = False
 NP_CONFIG.request_timeout = 15
 
+# --- METRICS ---
+class CrawlMetrics:
+    """Thread-safe counters and histograms for one crawl run.
+
+    `inc` bumps a labelled counter and `observe` adds a value to a labelled
+    histogram with LATENCY_BUCKETS. At the end of the run `write_prometheus`
+    dumps everything in the Prometheus text format and `write_report` writes
+    the same data plus derived figures as a JSON run report.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.started = time.time()
+        self.counters = defaultdict(Counter)
+        self.histograms = defaultdict(dict)
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, n: int = 1, **labels):
+        with self._lock:
+            self.counters[name][tuple(sorted(labels.items()))] += n
+
+    def observe(self, name: str, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            hist = self.histograms[name].setdefault(key, {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0})
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    hist['buckets'][i] += 1
+            hist['sum'] += value
+            hist['count'] += 1
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def total(self, name: str, **labels) -> int:
+        """Sum of a counter over every label set that includes `labels`."""
+        with self._lock:
+            return sum(value for key, value in self.counters[name].items() if set(labels.items()) <= set(key))
+
+    def articles_per_minute(self) -> float:
+        minutes = max((time.time() - self.started) / 60, 1e-9)
+        return round(self.total('articles_total', outcome='validated') / minutes, 2)
+
+    @staticmethod
+    def _labels(key: tuple, extra: str = '') -> str:
+        parts = []
+        for k, v in key:
+            value = str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            parts.append(f'{k}="{value}"')
+        if extra:
+            parts.append(extra)
+        return '{' + ','.join(parts) + '}' if parts else ''
+
+    def write_prometheus(self, path: str):
+        """Write all metrics as a Prometheus textfile (atomically, as the textfile collector expects)."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                lines.append(f"# TYPE crawler_{name} counter")
+                lines += [f"crawler_{name}{self._labels(key)} {value}" for key, value in sorted(series.items())]
+            for name, series in sorted(self.histograms.items()):
+                lines.append(f"# TYPE crawler_{name} histogram")
+                for key, hist in sorted(series.items()):
+                    for bound, count in zip(self.buckets, hist['buckets']):
+                        labels = self._labels(key, f'le="{bound}"')
+                        lines.append(f"crawler_{name}_bucket{labels} {count}")
+                    labels = self._labels(key, 'le="+Inf"')
+                    lines.append(f"crawler_{name}_bucket{labels} {hist['count']}")
+                    lines.append(f"crawler_{name}_sum{self._labels(key)} {hist['sum']:.6f}")
+                    lines.append(f"crawler_{name}_count{self._labels(key)} {hist['count']}")
+        lines.append("# TYPE crawler_articles_per_minute gauge")
+        lines.append(f"crawler_articles_per_minute {self.articles_per_minute()}")
+        lines.append("# TYPE crawler_run_duration_seconds gauge")
+        lines.append(f"crawler_run_duration_seconds {time.time() - self.started:.3f}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(f"{path}.tmp", path)
+
+    def write_report(self, path: str, extra: Optional[Dict] = None):
+        """Write a JSON run report: phase totals, histograms, counters and derived throughput."""
+        with self._lock:
+            counters = {name: [{'labels': dict(key), 'value': value} for key, value in series.items()]
+                        for name, series in self.counters.items()}
+            histograms = {name: [dict(hist, labels=dict(key)) for key, hist in series.items()]
+                          for name, series in self.histograms.items()}
+            phases = {dict(key)['phase']: {'count': hist['count'], 'total_seconds': round(hist['sum'], 3),
+                                           'mean_seconds': round(hist['sum'] / hist['count'], 3)}
+                      for key, hist in self.histograms.get('phase_seconds', {}).items() if hist['count']}
+        report = {
+            'started': datetime.fromtimestamp(self.started).isoformat(),
+            'finished': datetime.now().isoformat(),
+            'duration_seconds': round(time.time() - self.started, 3),
+            'articles_per_minute': self.articles_per_minute(),
+            'phases': phases,
+            'buckets': list(self.buckets),
+            'counters': counters,
+            'histograms': histograms,
+            **(extra or {})
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+
+METRICS = CrawlMetrics()
+
+def export_metrics(extra: Optional[Dict] = None):
+    """Write this run's Prometheus textfile and JSON report to METRICS_DIR."""
+    prom_path = os.path.join(METRICS_DIR, f"{NAMA_FILE_OUTPUT}_{METRICS_RUN_NAME}.prom")
+    report_path = os.path.join(METRICS_DIR, f"{NAMA_FILE_OUTPUT}_{METRICS_RUN_NAME}_"
+                                            f"{datetime.fromtimestamp(METRICS.started):%Y%m%d_%H%M%S}.json")
+    config = {'mode': CRAWL_MODE, 'max_workers': MAX_WORKERS, 'timeout': TIMEOUT, 'http_timeout': HTTP_TIMEOUT,
+              'parse_processes': PARSE_PROCESSES, 'scout_workers': SCOUT_WORKERS}
+    METRICS.write_prometheus(prom_path)
+    METRICS.write_report(report_path, {'config': config, **(extra or {})})
+    logger.info(f"Metrics written to {prom_path} and {report_path}")
+
 # --- DECORATOR & HELPER FUNCTIONS ---
 def retry_with_backoff(max_retries=MAX_RETRIES, backoff_base=2):
     def decorator(func):
@@ -86,8 +345,10 @@ def retry_with_backoff(max_retries=MAX_RETRIES, backoff_base=2):
                     return func(*args, **kwargs)
                 except Exception as e:
                     if attempt == max_retries - 1:
+                        METRICS.inc('retries_exhausted_total', function=func.__name__)
                         logger.error(f"Max retries reached for {func.__name__}: {e}")
                         return None
+                    METRICS.inc('retries_total', function=func.__name__)
                     wait_time = min(backoff_base ** attempt + random.uniform(0, 1), MAX_DELAY)
                     logger.warning(f"Attempt {attempt + 1} for {func.__name__} failed, retrying in {wait_time:.2f}s...")
                     time.sleep(wait_time)
@@ -95,6 +356,30 @@ def retry_with_backoff(max_retries=MAX_RETRIES, backoff_base=2):
         return wrapper
     return decorator
 
+@lru_cache(maxsize=1)
+def resolve_chromedriver_path() -> str:
+    """Resolve the chromedriver binary once per process."""
+    path = ChromeDriverManager().install()
+    logger.info(f"Using chromedriver: {path}")
+    return path
+
+def blocked_url_patterns() -> List[str]:
+    """URL patterns for Network.setBlockedURLs built from the resource-type and domain blocklists."""
+    patterns = []
+    for rtype in BLOCKED_RESOURCE_TYPES:
+        for ext in RESOURCE_TYPE_EXTENSIONS.get(rtype, []):
+            patterns += [f"*.{ext}", f"*.{ext}?*"]
+    for entry in BLOCKED_DOMAINS:
+        # Host (dan subdomainnya) dicocokkan di posisi host URL, agar tidak mengenai URL halaman artikel
+        host, _, path = entry.partition('/')
+        patterns += [f"*://{host}/{path}*", f"*://*.{host}/{path}*"]
+    return patterns
+
+def apply_blocking_policy(driver: webdriver.Chrome, patterns: List[str]):
+    """Tell Chrome to drop every request matching one of `patterns`."""
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+
 def create_driver() -> webdriver.Chrome:
     """Membuat instance driver Chrome baru dengan setelan optimal."""
     chrome_options = Options()
@@ -107,119 +392,1668 @@ def create_driver() -> webdriver.Chrome:
     chrome_options.page_load_strategy = 'eager'
     if not ENABLE_JAVASCRIPT:
         chrome_options.add_argument("--disable-javascript")
+    if MEASURE_BLOCKING:
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
     
-    service = Service(ChromeDriverManager().install())
+    service = Service(resolve_chromedriver_path())
     driver = webdriver.Chrome(service=service, options=chrome_options)
     driver.set_page_load_timeout(TIMEOUT)
+    if BLOCK_RESOURCES:
+        apply_blocking_policy(driver, blocked_url_patterns())
     return driver
 
+# Penghematan per domain dari mode ukur: {domain: {'pages', 'bytes_saved', 'ms_saved'}}
+BLOCKING_SAVINGS = defaultdict(lambda: {'pages': 0, 'bytes_saved': 0, 'ms_saved': 0.0})
+_SAVINGS_LOCK = threading.Lock()
+
+def transferred_bytes(driver: webdriver.Chrome) -> int:
+    """Sum encodedDataLength of finished requests from the performance log since the last call."""
+    total = 0
+    for entry in driver.get_log('performance'):
+        message = json.loads(entry['message'])['message']
+        if message.get('method') == 'Network.loadingFinished':
+            total += int(message['params'].get('encodedDataLength', 0))
+    return total
+
+def load_with_blocking_measurement(driver: webdriver.Chrome, url: str, domain: str):
+    """Load `url` without and then with the blocking policy and record the savings for `domain`.
+
+    The blocked load runs last, so the driver is left on the page as the normal fetch would.
+    """
+    measurements = {}
+    driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': True})
+    try:
+        for label, patterns in (('unblocked', []), ('blocked', blocked_url_patterns())):
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+            driver.get_log('performance')
+            started = time.monotonic()
+            driver.get(url)
+            elapsed_ms = (time.monotonic() - started) * 1000
+            time.sleep(MEASURE_SETTLE_SECONDS)
+            measurements[label] = (transferred_bytes(driver), elapsed_ms)
+    finally:
+        driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': False})
+        if not BLOCK_RESOURCES:
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+    
+    with _SAVINGS_LOCK:
+        stats = BLOCKING_SAVINGS[domain]
+        stats['pages'] += 1
+        stats['bytes_saved'] += measurements['unblocked'][0] - measurements['blocked'][0]
+        stats['ms_saved'] += measurements['unblocked'][1] - measurements['blocked'][1]
+
+def log_blocking_savings():
+    """Log average bytes and milliseconds saved per page for every measured domain."""
+    with _SAVINGS_LOCK:
+        items = sorted(BLOCKING_SAVINGS.items(), key=lambda kv: -kv[1]['bytes_saved'])
+    logger.info("Resource blocking savings per domain (avg per page):")
+    for domain, stats in items:
+        pages = stats['pages']
+        logger.info(f"  {domain}: {pages} pages, {stats['bytes_saved'] / pages / 1024:.1f} KB, "
+                    f"{stats['ms_saved'] / pages:.0f} ms")
+
+def is_driver_alive(driver: webdriver.Chrome) -> bool:
+    """Check whether the WebDriver session still responds."""
+    try:
+        driver.execute_script("return 1")
+        return True
+    except Exception:
+        return False
+
+def driver_rss_mb(driver: webdriver.Chrome) -> float:
+    """Total RSS (MB) of chromedriver and its Chrome children, 0 if unknown."""
+    if psutil is None:
+        return 0.0
+    try:
+        proc = psutil.Process(driver.service.process.pid)
+        procs = [proc] + proc.children(recursive=True)
+        return sum(p.memory_info().rss for p in procs) / (1024 * 1024)
+    except Exception:
+        return 0.0
+
+class DriverPool:
+    """Pool of reusable Chrome drivers shared by the article workers.
+
+    Drivers are created lazily, recycled after `max_pages` page loads or once
+    their process tree exceeds `max_rss_mb`, and replaced when the session dies.
+    """
+
+    def __init__(self, size: int = MAX_WORKERS, max_pages: int = DRIVER_MAX_PAGES,
+                 max_rss_mb: int = DRIVER_MAX_RSS_MB):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._pages = {}
+        self._lock = threading.Lock()
+        self.stats = {'created': 0, 'recycled': 0, 'crashed': 0, 'pages': 0}
+
+    def _create(self) -> webdriver.Chrome:
+        with METRICS.timer('driver_startup_seconds'):
+            driver = create_driver()
+        with self._lock:
+            self._pages[id(driver)] = 0
+            self.stats['created'] += 1
+        return driver
+
+    def _discard(self, driver: webdriver.Chrome, reason: str):
+        with self._lock:
+            self._pages.pop(id(driver), None)
+            self.stats[reason] += 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _checkout(self) -> webdriver.Chrome:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._create()
+
+    def _checkin(self, driver: webdriver.Chrome):
+        with self._lock:
+            self._pages[id(driver)] += 1
+            self.stats['pages'] += 1
+            pages = self._pages[id(driver)]
+        if pages >= self.max_pages:
+            logger.debug(f"Recycling driver after {pages} pages")
+            self._discard(driver, 'recycled')
+        elif self.max_rss_mb and driver_rss_mb(driver) > self.max_rss_mb:
+            logger.debug(f"Recycling driver above {self.max_rss_mb} MB RSS")
+            self._discard(driver, 'recycled')
+        else:
+            self._idle.put(driver)
+
+    @contextmanager
+    def driver(self):
+        """Check a driver out of the pool for the duration of the block."""
+        self._slots.acquire()
+        driver = None
+        try:
+            driver = self._checkout()
+            yield driver
+        except Exception as e:
+            # Bukan hanya WebDriverException: jika chromedriver mati, urllib3 melempar MaxRetryError/ConnectionRefusedError
+            if driver is not None and not isinstance(e, TimeoutException) and not is_driver_alive(driver):
+                logger.warning("Driver session crashed, replacing it")
+                self._discard(driver, 'crashed')
+                driver = None
+            raise
+        finally:
+            if driver is not None:
+                self._checkin(driver)
+            self._slots.release()
+
+    def close(self):
+        """Quit every idle driver in the pool."""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+def create_http_session(pool_size: int = MAX_WORKERS * 2) -> requests.Session:
+    """Create a keep-alive HTTP session with a connection pool sized for the workers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'User-Agent': HTTP_USER_AGENT,
+        'Accept': 'text/html,application/xhtml+xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'id-ID,id;q=0.9,en;q=0.8',
+    })
+    return session
+
+HTTP_SESSION = create_http_session()
+
+# Sinyal hasil fetch per thread ('throttled' / 'timeout'), dibaca scheduler setelah tiap artikel
+_FETCH_SIGNAL = threading.local()
+
+def reset_fetch_signal():
+    _FETCH_SIGNAL.value = None
+
+def record_fetch_signal(signal: str):
+    """Note that the current fetch was rate-limited ('throttled') or timed out ('timeout')."""
+    if getattr(_FETCH_SIGNAL, 'value', None) != 'throttled':
+        _FETCH_SIGNAL.value = signal
+
+def current_fetch_signal() -> Optional[str]:
+    return getattr(_FETCH_SIGNAL, 'value', None)
+
+# Jumlah artikel yang berhasil ditangani per tier fetch ('http', 'selenium', 'selenium_js', 'failed')
+FETCH_TIER_STATS = Counter()
+_TIER_STATS_LOCK = threading.Lock()
+
+def record_fetch_tier(tier: str):
+    """Count one article as handled by the given fetch tier."""
+    with _TIER_STATS_LOCK:
+        FETCH_TIER_STATS[tier] += 1
+
 def generate_content_hash(text: str) -> str:
     """Generate hash for content deduplication."""
     return hashlib.md5(text.encode()).hexdigest()
 
-def validate_article_data(article_data: Dict) -> bool:
-    """Validate if article data meets minimum requirements."""
-    if not article_data: return False
+def validation_failure_reason(article_data: Dict) -> Optional[str]:
+    """Why an article fails validation, or None if it meets the minimum requirements."""
+    if not article_data: return 'empty'
     text = article_data.get('teks_berita', '')
     title = article_data.get('judul', '')
-    if len(text) < MIN_TEXT_LENGTH or not title: return False
-    if text and len(text) > 100 and text.count(text[:100]) > 2: return False
-    return True
+    if len(text) < MIN_TEXT_LENGTH: return 'text_too_short'
+    if not title: return 'missing_title'
+    if text and len(text) > 100 and text.count(text[:100]) > 2: return 'repeated_text'
+    return None
+
+def validate_article_data(article_data: Dict) -> bool:
+    """Validate if article data meets minimum requirements."""
+    return validation_failure_reason(article_data) is None
+
+class UrlFrontier:
+    """Persistent SQLite record of every scouted URL and its crawl state.
+
+    States: 'scouted' (known, not attempted yet), 'fetched' (page downloaded,
+    outcome not recorded yet), 'skipped' (domain skipped by the strategy learner
+    this run), 'failed' and 'validated'. URLs that are still 'scouted'/'fetched'/
+    'skipped', or 'failed' with fewer than `max_attempts` attempts, are eligible
+    for the next run, so an interrupted crawl resumes where it stopped.
+
+    With `shared=True` the database lives on a path several processes or hosts
+    can open, and workers claim URLs through time-limited leases (`lease`), so
+    no URL is fetched by two workers at once and a dead worker's URLs are picked
+    up again once its leases expire. Rollback journaling is used in that case
+    because WAL needs shared memory that network filesystems do not provide.
+    """
+
+    def __init__(self, path: str = FRONTIER_PATH, max_attempts: int = FRONTIER_MAX_ATTEMPTS,
+                 shared: bool = False, lease_seconds: float = LEASE_SECONDS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=60, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=DELETE" if shared else "PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS urls (
+                    url TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    content_hash TEXT,
+                    article_json TEXT NOT NULL,
+                    first_seen TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(urls)")}
+            if 'lease_owner' not in columns:
+                self._conn.execute("ALTER TABLE urls ADD COLUMN lease_owner TEXT")
+                self._conn.execute("ALTER TABLE urls ADD COLUMN lease_expires REAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _is_eligible(self, state: str, attempts: int) -> bool:
+        if state in ('scouted', 'fetched', 'skipped'):
+            return True
+        return state == 'failed' and attempts < self.max_attempts
+
+    def add_scouted(self, article_info: Dict) -> bool:
+        """Record a scouted article; return True if it should be fetched this run."""
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO urls (url, state, article_json, first_seen, updated_at) "
+                "VALUES (?, 'scouted', ?, ?, ?)",
+                (article_info['url'], json.dumps(article_info, ensure_ascii=False, default=str), now, now)
+            )
+            state, attempts = self._conn.execute(
+                "SELECT state, attempts FROM urls WHERE url = ?", (article_info['url'],)
+            ).fetchone()
+        return self._is_eligible(state, attempts)
+
+    def is_settled(self, url: str) -> bool:
+        """True if `url` is already recorded and not eligible for fetching (validated or out of retries)."""
+        with self._lock:
+            row = self._conn.execute("SELECT state, attempts FROM urls WHERE url = ?", (url,)).fetchone()
+        return row is not None and not self._is_eligible(*row)
+
+    def pending(self) -> List[Dict]:
+        """Articles left over from earlier runs that are still eligible for fetching."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, attempts, article_json FROM urls WHERE state != 'validated' ORDER BY first_seen"
+            ).fetchall()
+        return [json.loads(info) for state, attempts, info in rows if self._is_eligible(state, attempts)]
+
+    def _update(self, url: str, sql: str, params: tuple = ()):
+        with self._lock:
+            self._conn.execute(f"UPDATE urls SET {sql}, updated_at = ? WHERE url = ?",
+                               params + (datetime.now().isoformat(), url))
+
+    @contextmanager
+    def _transaction(self):
+        """Hold the database write lock across processes (BEGIN IMMEDIATE) for a read-modify-write."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    _ELIGIBLE_SQL = ("(state IN ('scouted', 'fetched') OR (state = 'failed' AND attempts < ?)) "
+                     "AND (lease_expires IS NULL OR lease_expires < ?)")
+
+    def lease(self, owner: str, limit: int) -> List[Dict]:
+        """Atomically claim up to `limit` eligible URLs for `owner` until the lease expires."""
+        now = time.time()
+        with self._transaction() as conn:
+            rows = conn.execute(
+                f"SELECT url, article_json FROM urls WHERE {self._ELIGIBLE_SQL} ORDER BY first_seen LIMIT ?",
+                (self.max_attempts, now, limit)
+            ).fetchall()
+            conn.executemany("UPDATE urls SET lease_owner = ?, lease_expires = ? WHERE url = ?",
+                             [(owner, now + self.lease_seconds, url) for url, _ in rows])
+        return [json.loads(info) for _, info in rows]
+
+    def renew_leases(self, owner: str):
+        """Extend every lease still held by `owner` (URLs still in flight on that worker)."""
+        with self._lock:
+            self._conn.execute("UPDATE urls SET lease_expires = ? WHERE lease_owner = ?",
+                               (time.time() + self.lease_seconds, owner))
+
+    def has_open_work(self) -> bool:
+        """True while any URL is eligible for fetching or held under a live lease."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM urls WHERE (state IN ('scouted', 'fetched') OR (state = 'failed' AND attempts < ?)) "
+                "OR lease_expires >= ? LIMIT 1",
+                (self.max_attempts, now)
+            ).fetchone()
+        return row is not None
+
+    def reset_skipped(self):
+        """Make URLs skipped in an earlier run leasable again (shared mode skips them only per run)."""
+        with self._lock:
+            self._conn.execute("UPDATE urls SET state = 'scouted' WHERE state = 'skipped'")
+
+    def set_scouting_done(self, done: bool):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('scouting_done', ?)",
+                               ('1' if done else '0',))
+
+    def scouting_done(self) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'scouting_done'").fetchone()
+        return row is not None and row[0] == '1'
+
+    def start_attempt(self, url: str):
+        self._update(url, "attempts = attempts + 1")
+
+    def mark_fetched(self, url: str):
+        self._update(url, "state = 'fetched'")
+
+    def mark_skipped(self, url: str):
+        """Release a URL dropped before fetching; attempts are left untouched."""
+        self._update(url, "state = 'skipped', lease_owner = NULL, lease_expires = NULL")
+
+    def mark_failed(self, url: str):
+        self._update(url, "state = 'failed', lease_owner = NULL, lease_expires = NULL")
+
+    def mark_validated(self, url: str, content_hash: str):
+        self._update(url, "state = 'validated', content_hash = ?, lease_owner = NULL, lease_expires = NULL",
+                     (content_hash,))
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._conn.execute("SELECT state, COUNT(*) FROM urls GROUP BY state").fetchall())
+
+    def close(self):
+        self._conn.close()
+
+_TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'ocid', 'ref')
+
+def canonicalize_url(url: str) -> str:
+    """Normalise a URL for use as a cache key: lowercase host, no fragment or tracking params."""
+    parts = urlparse(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith(_TRACKING_PARAMS)]
+    return urlunparse((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', '',
+                       urlencode(sorted(query)), ''))
+
+class HtmlCache:
+    """Compressed, content-addressed on-disk cache of fetched article HTML.
+
+    Each page body is gzipped once under `objects/` by the SHA-256 of its
+    content; a SQLite index maps canonical URLs to those blobs along with the
+    scouted article metadata. Least recently used entries are evicted once the
+    blobs exceed `max_mb`.
+    """
+
+    def __init__(self, directory: str = HTML_CACHE_DIR, max_mb: int = HTML_CACHE_MAX_MB):
+        self.directory = directory
+        self.max_bytes = max_mb * 1024 * 1024
+        os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(directory, 'index.db'), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    article_json TEXT NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._total = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM pages)"
+            ).fetchone()[0]
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.directory, 'objects', digest[:2], f"{digest}.html.gz")
+
+    def _release(self, digest: str, size: int):
+        """Delete a blob once no URL refers to it any more (caller holds the lock)."""
+        if self._conn.execute("SELECT 1 FROM pages WHERE digest = ? LIMIT 1", (digest,)).fetchone():
+            return
+        try:
+            os.remove(self._blob_path(digest))
+        except FileNotFoundError:
+            pass
+        self._total -= size
+
+    def put(self, article_info: Dict, html: str):
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        url = canonicalize_url(article_info['url'])
+        with self._lock, self._conn:
+            known = self._conn.execute("SELECT size FROM pages WHERE digest = ? LIMIT 1", (digest,)).fetchone()
+            if known:
+                size = known[0]
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                compressed = gzip.compress(data)
+                with open(path + '.tmp', 'wb') as f:
+                    f.write(compressed)
+                os.replace(path + '.tmp', path)
+                size = len(compressed)
+                self._total += size
+            previous = self._conn.execute("SELECT digest, size FROM pages WHERE url = ?", (url,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, digest, size, article_json, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (url, digest, size, json.dumps(article_info, ensure_ascii=False, default=str), time.time())
+            )
+            if previous and previous[0] != digest:
+                self._release(*previous)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used URLs until the cache is back under 90% of its budget."""
+        rows = self._conn.execute("SELECT url, digest, size FROM pages ORDER BY accessed_at").fetchall()
+        evicted = 0
+        for url, digest, size in rows:
+            if self._total <= self.max_bytes * 0.9:
+                break
+            self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            self._release(digest, size)
+            evicted += 1
+        logger.info(f"HTML cache evicted {evicted} entries ({self._total / 1024 / 1024:.1f} MB left)")
+
+    def get(self, url: str) -> Optional[str]:
+        url = canonicalize_url(url)
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT digest FROM pages WHERE url = ?", (url,)).fetchone()
+            if not row:
+                return None
+            self._conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url))
+        try:
+            with gzip.open(self._blob_path(row[0]), 'rb') as f:
+                return f.read().decode('utf-8')
+        except FileNotFoundError:
+            return None
+
+    def iter_entries(self) -> Iterator[Tuple[Dict, str]]:
+        """Yield (article_info, html) for every cached page."""
+        with self._lock:
+            rows = self._conn.execute("SELECT digest, article_json FROM pages").fetchall()
+        for digest, article_json in rows:
+            try:
+                with gzip.open(self._blob_path(digest), 'rb') as f:
+                    yield json.loads(article_json), f.read().decode('utf-8')
+            except (FileNotFoundError, OSError) as e:
+                logger.warning(f"Unreadable cache blob {digest}: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+_CANONICAL_LINK_RE = re.compile(r'<link\b[^>]*\brel=["\']?canonical["\']?[^>]*>', re.IGNORECASE)
+_HREF_RE = re.compile(r'\bhref=["\']([^"\']+)["\']', re.IGNORECASE)
+
+def decode_google_news_url(url: str) -> Optional[str]:
+    """Extract the publisher URL embedded in (older-style) Google News article IDs, if any."""
+    parts = urlparse(url)
+    if not parts.netloc.endswith('news.google.com') or '/articles/' not in parts.path:
+        return None
+    article_id = parts.path.rsplit('/', 1)[-1]
+    try:
+        raw = base64.urlsafe_b64decode(article_id + '=' * (-len(article_id) % 4))
+    except (ValueError, TypeError):
+        return None
+    match = re.search(rb'https?://[\x21-\x7e]+', raw)
+    return match.group(0).decode('ascii') if match else None
+
+def find_canonical_link(html: str, base_url: str) -> Optional[str]:
+    """Return the absolute href of the page's <link rel="canonical">, if present."""
+    tag = _CANONICAL_LINK_RE.search(html)
+    href = _HREF_RE.search(tag.group(0)) if tag else None
+    if not href:
+        return None
+    return urljoin(base_url, href.group(1).strip())
+
+class UrlResolver:
+    """Resolve scouted links to canonical publisher URLs with a persistent SQLite cache.
+
+    Redirects are followed with pooled HTTP requests that inspect only the start
+    of the page, where <link rel="canonical"> lives. The rest of the body is
+    drained (up to RESOLVE_DRAIN_MAX_BYTES) so urllib3 can return the keep-alive
+    connection to the pool; larger bodies are cut off and the connection is
+    dropped instead. Links that cannot
+    be resolved are cached too, for `negative_ttl_hours`, so they are not
+    re-requested from news.google.com on every run; those requests share the
+    scouting rate limit.
+    """
+
+    def __init__(self, path: str = RESOLVE_CACHE_PATH, workers: int = RESOLVE_WORKERS,
+                 negative_ttl_hours: float = RESOLVE_NEGATIVE_TTL_HOURS):
+        self.negative_ttl = negative_ttl_hours * 3600
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.session = create_http_session(pool_size=workers)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.stats = Counter()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS resolved (url TEXT PRIMARY KEY, canonical TEXT NOT NULL, resolved_at TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS unresolved (url TEXT PRIMARY KEY, failed_at REAL NOT NULL)"
+            )
+
+    def _lookup(self, url: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT canonical FROM resolved WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def _store(self, url: str, canonical: str):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO resolved (url, canonical, resolved_at) VALUES (?, ?, ?)",
+                               (url, canonical, datetime.now().isoformat()))
+            self._conn.execute("DELETE FROM unresolved WHERE url = ?", (url,))
+
+    def _recently_failed(self, url: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT failed_at FROM unresolved WHERE url = ?", (url,)).fetchone()
+        return row is not None and time.time() - row[0] < self.negative_ttl
+
+    def _store_failure(self, url: str):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO unresolved (url, failed_at) VALUES (?, ?)", (url, time.time()))
+
+    def _resolve_uncached(self, url: str) -> Optional[str]:
+        decoded = decode_google_news_url(url)
+        target = decoded or url
+        if urlparse(target).netloc.endswith('news.google.com'):
+            GOOGLE_NEWS_LIMITER.wait()
+        try:
+            with self.session.get(target, timeout=HTTP_TIMEOUT, allow_redirects=True, stream=True) as response:
+                head, received = b'', 0
+                for chunk in response.iter_content(chunk_size=16384):
+                    if len(head) < RESOLVE_HEAD_BYTES:
+                        head += chunk
+                    received += len(chunk)
+                    if received > RESOLVE_DRAIN_MAX_BYTES:
+                        break
+                head = head[:RESOLVE_HEAD_BYTES]
+                final_url = response.url
+        except Exception as e:
+            logger.debug(f"Could not resolve {url[:70]}: {e}")
+            return canonicalize_url(decoded) if decoded else None
+        canonical = find_canonical_link(head.decode('utf-8', errors='ignore'), final_url) or final_url
+        if urlparse(canonical).netloc.endswith('news.google.com'):
+            return canonicalize_url(decoded) if decoded else None
+        return canonicalize_url(canonical)
+
+    def resolve(self, url: str) -> str:
+        """Canonical URL for `url`, or `url` itself when it cannot be resolved."""
+        cached = self._lookup(url)
+        if cached:
+            self.stats['cached'] += 1
+            return cached
+        if self._recently_failed(url):
+            self.stats['cached_unresolved'] += 1
+            return url
+        canonical = self._resolve_uncached(url)
+        if not canonical:
+            self._store_failure(url)
+            self.stats['unresolved'] += 1
+            return url
+        self._store(url, canonical)
+        self.stats['resolved'] += 1
+        return canonical
+
+    def resolve_article(self, article_info: Dict) -> Dict:
+        canonical = self.resolve(article_info['url'])
+        if canonical == article_info['url']:
+            return article_info
+        return {**article_info, 'url': canonical, 'google_news_url': article_info['url']}
+
+    def close(self):
+        self._conn.close()
+        self.session.close()
+
+# Diisi di main script; None berarti crawl tanpa frontier/cache (mis. process_articles_batch mandiri)
+FRONTIER: Optional[UrlFrontier] = None
+HTML_CACHE: Optional[HtmlCache] = None
+
+def note_html_fetched(article_info: Dict, html: str):
+    """Hook called by every fetch tier once a page's HTML has been downloaded."""
+    if FRONTIER is not None:
+        FRONTIER.mark_fetched(article_info['url'])
+    if HTML_CACHE is not None:
+        try:
+            HTML_CACHE.put(article_info, html)
+        except Exception as e:
+            logger.warning(f"Could not cache HTML for {article_info['url'][:70]}: {e}")
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls at least `min_interval` seconds apart."""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_time)
+            self._next_time = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+# Satu limiter untuk semua request ke Google News (scouting RSS maupun resolusi link)
+GOOGLE_NEWS_LIMITER = RateLimiter(SCOUT_MIN_INTERVAL)
+
+def date_windows(start_date: str, end_date: str, window: Optional[str] = SCOUT_WINDOW) -> List[Tuple[str, str]]:
+    """Split [start_date, end_date] into weekly or monthly windows that share their boundary days."""
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    if not window:
+        return [(start_date, end_date)]
+    windows = []
+    while start < end:
+        if window == 'week':
+            nxt = start + timedelta(days=7)
+        else:
+            nxt = (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        nxt = min(nxt, end)
+        windows.append((start.strftime("%Y-%m-%d"), nxt.strftime("%Y-%m-%d")))
+        start = nxt
+    return windows or [(start_date, end_date)]
+
+GOOGLE_NEWS_RSS_SEARCH = "https://news.google.com/rss/search?q={query}&ceid=ID:id&hl=id&gl=ID"
+_LAST_BUILD_DATE_RE = re.compile(rb'<lastBuildDate>.*?</lastBuildDate>', re.DOTALL)
+
+def entry_to_article(entry, keyword: str) -> Dict:
+    """Convert one Google News RSS entry into a scouted article dict."""
+    return {
+        'title': entry.title,
+        'source': entry.source.get('title', 'Unknown'),
+        'date': entry.published,
+        'url': entry.link,
+        'source_url': entry.source.get('href', ''),
+        'keyword': keyword
+    }
+
+class ScoutCache:
+    """Conditional-GET cache of Google News search feeds keyed by keyword and date window.
+
+    Feeds are requested with If-None-Match / If-Modified-Since; a 304, or a body
+    whose hash (ignoring <lastBuildDate>) matches the stored one, returns the
+    cached articles without re-parsing. Windows that ended more than
+    SCOUT_STABLE_AFTER_DAYS ago are not requested again within SCOUT_STABLE_TTL_HOURS.
+    """
+
+    def __init__(self, path: str = SCOUT_CACHE_PATH, session: requests.Session = None):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.session = session or HTTP_SESSION
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.stats = Counter()
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS feeds (
+                    keyword TEXT NOT NULL,
+                    start_date TEXT NOT NULL,
+                    end_date TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body_hash TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    articles_json TEXT NOT NULL,
+                    checked_at REAL NOT NULL,
+                    PRIMARY KEY (keyword, start_date, end_date)
+                )
+            """)
+
+    def _lookup(self, key: Tuple[str, str, str]) -> Optional[Tuple]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT etag, last_modified, body_hash, articles_json, checked_at FROM feeds "
+                "WHERE keyword = ? AND start_date = ? AND end_date = ?", key
+            ).fetchone()
+
+    def _touch(self, key: Tuple[str, str, str]):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE feeds SET checked_at = ? WHERE keyword = ? AND start_date = ? AND end_date = ?",
+                               (time.time(),) + key)
+
+    def _store(self, key: Tuple[str, str, str], response: requests.Response, body_hash: str, articles: List[Dict]):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO feeds (keyword, start_date, end_date, etag, last_modified, body_hash, body, "
+                "articles_json, checked_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                key + (response.headers.get('ETag'), response.headers.get('Last-Modified'), body_hash,
+                       gzip.compress(response.content), json.dumps(articles, ensure_ascii=False), time.time())
+            )
+
+    def _is_stable(self, end_date: str, checked_at: float) -> bool:
+        ended = datetime.strptime(end_date, "%Y-%m-%d")
+        return (datetime.now() - ended > timedelta(days=SCOUT_STABLE_AFTER_DAYS)
+                and time.time() - checked_at < SCOUT_STABLE_TTL_HOURS * 3600)
+
+    def search(self, keyword: str, start_date: str, end_date: str) -> List[Dict]:
+        """Articles for one keyword/window, re-parsing the feed only when it actually changed."""
+        key = (keyword, start_date, end_date)
+        cached = self._lookup(key)
+        if cached and self._is_stable(end_date, cached[4]):
+            self.stats['stable'] += 1
+            return json.loads(cached[3])
+        
+        headers = {}
+        if cached and cached[0]:
+            headers['If-None-Match'] = cached[0]
+        if cached and cached[1]:
+            headers['If-Modified-Since'] = cached[1]
+        url = GOOGLE_NEWS_RSS_SEARCH.format(query=quote_plus(f"{keyword} after:{start_date} before:{end_date}"))
+        GOOGLE_NEWS_LIMITER.wait()  # hanya request sungguhan yang memakai slot rate limit
+        response = self.session.get(url, headers=headers, timeout=HTTP_TIMEOUT)
+        if response.status_code == 304 and cached:
+            self.stats['not_modified'] += 1
+            self._touch(key)
+            return json.loads(cached[3])
+        response.raise_for_status()
+        
+        body_hash = hashlib.sha256(_LAST_BUILD_DATE_RE.sub(b'', response.content)).hexdigest()
+        if cached and cached[2] == body_hash:
+            self.stats['unchanged'] += 1
+            self._touch(key)
+            return json.loads(cached[3])
+        
+        self.stats['changed' if cached else 'new'] += 1
+        feed = feedparser.parse(response.content)
+        articles = [entry_to_article(entry, keyword) for entry in feed.entries[:LIMIT_ARTICLES_PER_KEYWORD]]
+        self._store(key, response, body_hash, articles)
+        return articles
+
+    def close(self):
+        self._conn.close()
+
+# Diisi di main script; None berarti scouting langsung lewat pygooglenews tanpa cache
+SCOUT_CACHE: Optional[ScoutCache] = None
 
 # --- MAIN FUNCTIONS ---
 
 @retry_with_backoff(max_retries=2)
 def scout_with_pygooglenews(keyword: str, start_date: str, end_date: str) -> List[Dict]:
     """Phase 1: Scout news using pygooglenews with retry logic."""
-    logger.info(f"Searching for keyword: '{keyword}'...")
-    gn = GoogleNews(lang='id', country='ID')
-    
-    search_result = gn.search(keyword, from_=start_date, to_=end_date)
+    logger.info(f"Searching for keyword: '{keyword}' ({start_date} to {end_date})...")
+    if SCOUT_CACHE is not None:
+        articles = SCOUT_CACHE.search(keyword, start_date, end_date)
+    else:
+        gn = GoogleNews(lang='id', country='ID')
+        GOOGLE_NEWS_LIMITER.wait()
+        search_result = gn.search(keyword, from_=start_date, to_=end_date)
+        # --- PERUBAHAN: Terapkan limit dengan slicing [:LIMIT_ARTICLES_PER_KEYWORD] ---
+        articles = [entry_to_article(entry, keyword)
+                    for entry in search_result.get('entries', [])[:LIMIT_ARTICLES_PER_KEYWORD]]
     
-    if not search_result.get('entries'):
+    if not articles:
         logger.info(f"No results found for '{keyword}'")
         return []
     
-    articles = []
-    # --- PERUBAHAN: Terapkan limit dengan slicing [:LIMIT_ARTICLES_PER_KEYWORD] ---
-    for entry in search_result['entries'][:LIMIT_ARTICLES_PER_KEYWORD]:
-        article = {
-            'title': entry.title,
-            'source': entry.source.get('title', 'Unknown'),
-            'date': entry.published,
-            'url': entry.link,
-            'keyword': keyword
-        }
-        articles.append(article)
-    
     logger.info(f"Found {len(articles)} articles for '{keyword}' (limited to {LIMIT_ARTICLES_PER_KEYWORD})")
     return articles
 
-def analyze_article_with_selenium(article_info: Dict) -> Optional[Dict]:
-    """Phase 2 & 3: Use Selenium to download and newspaper4k to parse."""
+def parse_article_html(article_info: Dict, html: str) -> Dict:
+    """Parse raw HTML with newspaper4k into an (unvalidated) result row."""
+    url = article_info['url']
+    article = Article(url, config=NP_CONFIG)
+    article.html = html
+    article.parse()
+    
+    return {
+        'keyword_pencarian': article_info['keyword'],
+        'sumber': article_info['source'],
+        'tanggal_publikasi': article.publish_date or article_info['date'],
+        'judul': article.title or article_info['title'],
+        'penulis': ', '.join(article.authors) if article.authors else '',
+        'url': url,
+        'teks_berita': article.text,
+        'content_hash': generate_content_hash(article.text or '')
+    }
+
+def fetch_html_with_http(url: str, session: requests.Session = None) -> Optional[str]:
+    """Fetch a page over plain HTTP, returning its HTML or None if it is not usable."""
+    session = session or HTTP_SESSION
+    response = session.get(url, timeout=HTTP_TIMEOUT, allow_redirects=True)
+    if response.status_code != 200:
+        logger.debug(f"HTTP {response.status_code} for {url[:70]}")
+        if response.status_code == 429 or response.status_code >= 500:
+            record_fetch_signal('throttled')
+        return None
+    if 'html' not in response.headers.get('Content-Type', 'text/html'):
+        return None
+    return response.text
+
+def parse_and_validate(article_info: Dict, html: str,
+                       timings: Optional[Dict[str, float]] = None) -> Tuple[Optional[Dict], Optional[str]]:
+    """Parse and validate one page; runs inside the parser process pool.
+
+    Returns (result, None) for a valid article or (None, reason) when validation rejects it.
+    Parse and validation durations are stored in `timings` when given.
+    """
+    started = time.perf_counter()
+    result = parse_article_html(article_info, html)
+    parsed = time.perf_counter()
+    reason = validation_failure_reason(result)
+    if timings is not None:
+        timings['parse'] = parsed - started
+        timings['validate'] = time.perf_counter() - parsed
+    return (None, reason) if reason else (result, None)
+
+def parse_and_validate_timed(article_info: Dict, html: str) -> Tuple[Tuple[Optional[Dict], Optional[str]], Dict]:
+    """Process-pool entry point: parse_and_validate plus its timings, recorded by the parent."""
+    timings = {}
+    return parse_and_validate(article_info, html, timings), timings
+
+def fetch_article_with_http(article_info: Dict) -> Optional[str]:
+    """Tier 1: fetch an article's HTML without a browser."""
     url = article_info['url']
-    driver = None
     try:
-        driver = create_driver()
-        logger.debug(f"Visiting: {url[:70]}...")
-        driver.get(url)
-        time.sleep(random.uniform(1, 3))
-        html = driver.page_source
-        
-        article = Article(url, config=NP_CONFIG)
-        article.html = html
-        article.parse()
-        
-        result = {
-            'keyword_pencarian': article_info['keyword'],
-            'sumber': article_info['source'],
-            'tanggal_publikasi': article.publish_date or article_info['date'],
-            'judul': article.title or article_info['title'],
-            'penulis': ', '.join(article.authors) if article.authors else '',
-            'url': url,
-            'teks_berita': article.text,
-            'content_hash': generate_content_hash(article.text or '')
+        return fetch_html_with_http(url)
+    except requests.Timeout:
+        record_fetch_signal('timeout')
+        logger.debug(f"HTTP tier timed out for {url[:70]}")
+    except Exception as e:
+        logger.debug(f"HTTP tier failed for {url[:70]}: {e}")
+    return None
+
+# Readability-style extractor: scores block elements by the paragraph text they hold and
+# returns only title, byline, publish date and body text as one compact JSON string.
+EXTRACT_MAIN_CONTENT_JS = r"""
+const meta = (sel) => { const el = document.querySelector(sel); return el ? (el.content || el.getAttribute('datetime') || el.textContent || '').trim() : ''; };
+const str = (v) => typeof v === 'string' ? v.trim() : '';  // JSON-LD values may be objects/arrays
+let ldDate = '', ldAuthor = '';
+for (const s of document.querySelectorAll('script[type="application/ld+json"]')) {
+    try {
+        for (const d of [].concat(JSON.parse(s.textContent))) {
+            ldDate = ldDate || str(d.datePublished);
+            const a = d.author ? [].concat(d.author)[0] : null;
+            ldAuthor = ldAuthor || str(a) || str(a && a.name);
         }
-        
-        if not validate_article_data(result):
-            logger.warning(f"Article failed validation: {url[:70]}")
-            return None
-        
-        logger.info(f"Successfully processed: {url[:70]}")
-        return result
+    } catch (e) {}
+}
+const skip = 'nav, aside, footer, header, figure, form, script, style, noscript, [class*="related"], [class*="baca"], [class*="share"]';
+const scores = new Map();
+for (const p of document.querySelectorAll('p')) {
+    const text = p.innerText.trim();
+    if (text.length < 40 || p.closest(skip)) continue;
+    const parent = p.parentElement, grand = parent && parent.parentElement;
+    if (parent) scores.set(parent, (scores.get(parent) || 0) + text.length);
+    if (grand) scores.set(grand, (scores.get(grand) || 0) + text.length / 2);
+}
+let best = null, bestScore = 0;
+for (const [el, score] of scores) { if (score > bestScore) { best = el; bestScore = score; } }
+const paragraphs = best ? [...best.querySelectorAll('p')].filter(p => !p.closest(skip)).map(p => p.innerText.trim()).filter(t => t.length > 0) : [];
+return JSON.stringify({
+    title: meta('meta[property="og:title"]') || meta('h1') || document.title,
+    byline: meta('meta[name="author"]') || ldAuthor || meta('[rel="author"]') || meta('[itemprop="author"]'),
+    date: meta('meta[property="article:published_time"]') || meta('meta[itemprop="datePublished"]') || ldDate || meta('meta[name="pubdate"]') || meta('time[datetime]'),
+    text: paragraphs.join('\n\n')
+});
+"""
+
+def extract_article_in_browser(driver: webdriver.Chrome, article_info: Dict) -> Optional[Dict]:
+    """Run EXTRACT_MAIN_CONTENT_JS in the loaded page; return a validated result row or None."""
+    extracted = json.loads(driver.execute_script(EXTRACT_MAIN_CONTENT_JS))
+    text = extracted.get('text', '')
+    result = {
+        'keyword_pencarian': article_info['keyword'],
+        'sumber': article_info['source'],
+        'tanggal_publikasi': extracted.get('date') or article_info['date'],
+        'judul': extracted.get('title') or article_info['title'],
+        'penulis': extracted.get('byline', ''),
+        'url': article_info['url'],
+        'teks_berita': text,
+        'content_hash': generate_content_hash(text)
+    }
+    return result if validate_article_data(result) else None
+
+def fetch_article_with_selenium(article_info: Dict, pool: DriverPool) -> Optional[Union[str, Dict]]:
+    """Tier 2: load an article in a pooled Selenium driver.
+
+    Returns a ready result row when IN_BROWSER_EXTRACTION succeeds, otherwise the
+    rendered HTML for newspaper4k.
+    """
+    url = article_info['url']
+    try:
+        with pool.driver() as driver:
+            logger.debug(f"Visiting: {url[:70]}...")
+            if MEASURE_BLOCKING:
+                load_with_blocking_measurement(driver, url, article_domain(article_info))
+            else:
+                driver.get(url)
+                time.sleep(random.uniform(1, 3))
+            if IN_BROWSER_EXTRACTION:
+                try:
+                    result = extract_article_in_browser(driver, article_info)
+                    if result:
+                        return result
+                except WebDriverException:
+                    raise
+                except Exception as e:
+                    logger.debug(f"In-browser extraction failed for {url[:70]}: {e}")
+                logger.debug(f"Falling back to newspaper4k for {url[:70]}")
+            return driver.page_source
     except TimeoutException:
+        record_fetch_signal('timeout')
         logger.error(f"Timeout loading: {url[:70]}")
-        return None
     except Exception as e:
         logger.error(f"Error processing {url[:70]}: {e}")
-        return None
-    finally:
-        if driver:
-            driver.quit()
+    return None
+
+class ParseStage:
+    """Process pool that parses and validates HTML off the GIL-bound fetch threads.
+
+    `submit` blocks once `max_pending` pages are waiting to be parsed, which
+    throttles the fetch stage to the speed of the parse stage. If a parser
+    process dies (crash, OOM kill) the broken pool is replaced, so only the
+    pages in flight at that moment fail.
+    """
+
+    def __init__(self, max_processes: int = PARSE_PROCESSES, max_pending: int = PARSE_QUEUE_SIZE):
+        self.max_processes = max_processes
+        self._lock = threading.Lock()
+        self._executor = self._new_executor() if max_processes > 0 else None
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.max_processes,
+                                   mp_context=multiprocessing.get_context(PARSE_START_METHOD))
+
+    def _replace_broken(self, broken: ProcessPoolExecutor):
+        """Swap in a fresh pool unless another thread already replaced `broken`."""
+        with self._lock:
+            if self._executor is not broken:
+                return
+            logger.warning("Parser process pool broke (a parser process died), starting a new one")
+            METRICS.inc('parse_pool_restarts_total')
+            self._executor = self._new_executor()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, article_info: Dict, html: str, callback: Callable[[Future], None]):
+        """Parse in the background and call `callback(future)` with parse_and_validate's (result, reason)."""
+        if self._executor is None:
+            future = Future()
+            try:
+                future.set_result(parse_and_validate_timed(article_info, html))
+            except Exception as e:
+                future.set_exception(e)
+            self._deliver(future, callback)
+            return
+        self._slots.acquire()
+        try:
+            executor = self._executor
+            try:
+                future = executor.submit(parse_and_validate_timed, article_info, html)
+            except BrokenProcessPool:
+                self._replace_broken(executor)
+                executor = self._executor
+                future = executor.submit(parse_and_validate_timed, article_info, html)
+        except Exception:
+            self._slots.release()
+            raise
+        
+        def on_done(f: Future):
+            self._slots.release()
+            if isinstance(f.exception(), BrokenProcessPool):
+                self._replace_broken(executor)
+            self._deliver(f, callback)
+        future.add_done_callback(on_done)
+
+    @staticmethod
+    def _deliver(future: Future, callback: Callable[[Future], None]):
+        """Record the worker's timings and rejection reason, then pass (result, reason) on."""
+        outcome = Future()
+        try:
+            (result, reason), timings = future.result()
+        except Exception as e:
+            outcome.set_exception(e)
+        else:
+            for phase, seconds in timings.items():
+                METRICS.observe('phase_seconds', seconds, phase=phase)
+            if reason:
+                METRICS.inc('validation_rejections_total', reason=reason)
+            outcome.set_result((result, reason))
+        callback(outcome)
+
+    def close(self):
+        """Wait for pending parses (and their callbacks) and stop the processes."""
+        with self._lock:
+            executor = self._executor
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+_STOP = object()
+
+def article_domain(article_info: Dict) -> str:
+    """Publisher domain of an article (Google News links all share news.google.com)."""
+    netloc = urlparse(article_info.get('source_url') or article_info['url']).netloc.lower()
+    return netloc[4:] if netloc.startswith('www.') else netloc
+
+class DomainStatsStore:
+    """Per-domain fetch outcomes persisted across runs, used to pick each portal's strategy.
+
+    For every (domain, method) pair the store keeps the last `window` outcomes
+    (success, latency, text length, failure reason) in SQLite. From these the
+    next run starts domains where plain HTTP keeps failing directly on Selenium,
+    schedules chronically failing domains last, and lets only one probe URL per
+    run through for domains that practically never succeed.
+    """
+
+    def __init__(self, path: str = DOMAIN_STATS_PATH, window: int = DOMAIN_STATS_WINDOW,
+                 min_samples: int = DOMAIN_STATS_MIN_SAMPLES):
+        self.path = path
+        self.window = window
+        self.min_samples = min_samples
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._probed = set()
+        self.skipped = Counter()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS domain_stats (
+                    domain TEXT NOT NULL,
+                    method TEXT NOT NULL,
+                    outcomes_json TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (domain, method)
+                )
+            """)
+            rows = self._conn.execute("SELECT domain, method, outcomes_json FROM domain_stats").fetchall()
+        self._outcomes = {(domain, method): json.loads(outcomes) for domain, method, outcomes in rows}
+        if self._outcomes:
+            logger.info(f"Loaded fetch history for {len({d for d, _ in self._outcomes})} domains from {path}")
+
+    def record(self, domain: str, method: str, succeeded: bool, latency: float,
+               text_length: int = 0, reason: Optional[str] = None):
+        """Append one outcome for `domain` fetched with `method` ('http' or 'selenium')."""
+        with self._lock, self._conn:
+            outcomes = self._outcomes.setdefault((domain, method), [])
+            outcomes.append([int(succeeded), round(latency, 2), text_length, reason])
+            del outcomes[:-self.window]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO domain_stats (domain, method, outcomes_json, updated_at) VALUES (?, ?, ?, ?)",
+                (domain, method, json.dumps(outcomes), datetime.now().isoformat())
+            )
+
+    def _rows(self, domain: str, method: Optional[str] = None) -> List[list]:
+        with self._lock:
+            return [row for (d, m), outcomes in self._outcomes.items()
+                    if d == domain and method in (None, m) for row in outcomes]
+
+    def success_rate(self, domain: str, method: Optional[str] = None) -> Optional[float]:
+        """Recent success rate, or None while there are fewer than `min_samples` outcomes."""
+        rows = self._rows(domain, method)
+        if len(rows) < self.min_samples:
+            return None
+        return sum(row[0] for row in rows) / len(rows)
+
+    def preferred_tier(self, domain: str) -> str:
+        """Cheapest tier that works: 'http' unless it keeps failing on this domain."""
+        rate = self.success_rate(domain, 'http')
+        if rate is not None and rate < DOMAIN_HTTP_MIN_SUCCESS and random.random() >= DOMAIN_STATS_EXPLORE:
+            return 'selenium'
+        return 'http'
+
+    def priority(self, domain: str) -> int:
+        """Scheduling priority: 0 normally, 1 (served last) for chronically failing domains."""
+        rate = self.success_rate(domain)
+        return 1 if rate is not None and rate < DOMAIN_DEPRIORITIZE_BELOW else 0
+
+    def should_skip(self, domain: str) -> bool:
+        """True for a domain that (almost) never succeeds, except for one probe URL per run."""
+        rate = self.success_rate(domain)
+        if rate is None or rate >= DOMAIN_SKIP_BELOW:
+            return False
+        with self._lock:
+            if domain not in self._probed:
+                self._probed.add(domain)
+                return False
+            self.skipped[domain] += 1
+        return True
 
-def process_articles_batch(articles: List[Dict], max_workers: int = MAX_WORKERS) -> List[Dict]:
-    """Process articles in parallel with ThreadPoolExecutor."""
+    def summary(self) -> Dict[str, Dict[str, Dict]]:
+        """Success rate, median latency/text length and failure reasons per domain and method."""
+        with self._lock:
+            items = list(self._outcomes.items())
+        report = defaultdict(dict)
+        for (domain, method), rows in items:
+            successes = [row for row in rows if row[0]]
+            report[domain][method] = {
+                'samples': len(rows),
+                'success_rate': round(len(successes) / len(rows), 2),
+                'median_latency': round(statistics.median(row[1] for row in rows), 2),
+                'median_text_length': int(statistics.median(row[2] for row in successes)) if successes else 0,
+                'failure_reasons': dict(Counter(row[3] for row in rows if not row[0]))
+            }
+        return dict(report)
+
+    def close(self):
+        self._conn.close()
+
+# Diisi di main script; None berarti setiap domain mulai dari HTTP tanpa riwayat
+DOMAIN_STATS: Optional[DomainStatsStore] = None
+
+def record_domain_outcome(article_info: Dict, method: str, succeeded: bool, latency: float,
+                          result: Optional[Dict] = None, reason: Optional[str] = None):
+    if DOMAIN_STATS is not None:
+        text_length = len(result.get('teks_berita') or '') if result else 0
+        DOMAIN_STATS.record(article_domain(article_info), method, succeeded, latency, text_length, reason)
+
+class DomainState:
+    """Per-domain queue plus the AIMD-controlled concurrency limit and delay."""
+
+    def __init__(self, limit: float, delay: float, priority: int = 0):
+        self.limit = limit
+        self.delay = delay
+        self.priority = priority
+        self.in_flight = 0
+        self.next_time = 0.0
+        self.heap = []
+        self.completed = 0
+        self.throttled = 0
+
+class DomainScheduler:
+    """Per-domain politeness scheduler with AIMD-adapted concurrency and delay.
+
+    Workers `get` the next article whose domain has a free slot and whose delay
+    has elapsed, then report back with `done`. Fast successes raise a domain's
+    limit additively; timeouts and 429/5xx halve it and double its delay.
+    Transient failures are re-queued with a backoff instead of sleeping a worker.
+    """
+
+    def __init__(self, capacity: int = WORK_QUEUE_SIZE, initial_concurrency: float = DOMAIN_INITIAL_CONCURRENCY,
+                 max_concurrency: float = DOMAIN_MAX_CONCURRENCY, min_delay: float = DOMAIN_MIN_DELAY,
+                 max_delay: float = MAX_DELAY, target_latency: float = DOMAIN_TARGET_LATENCY,
+                 max_retries: int = MAX_RETRIES):
+        self.capacity = capacity
+        self.initial_concurrency = initial_concurrency
+        self.max_concurrency = max_concurrency
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.target_latency = target_latency
+        self.max_retries = max_retries
+        self._domains = {}
+        self._retries = Counter()
+        self._queued = 0
+        self._outstanding = 0
+        self._seq = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def _state(self, domain: str) -> DomainState:
+        if domain not in self._domains:
+            priority = DOMAIN_STATS.priority(domain) if DOMAIN_STATS is not None else 0
+            self._domains[domain] = DomainState(self.initial_concurrency, self.min_delay, priority)
+        return self._domains[domain]
+
+    def _push(self, article_info: Dict, not_before: float):
+        self._seq += 1
+        heapq.heappush(self._state(article_domain(article_info)).heap, (not_before, self._seq, article_info))
+        self._queued += 1
+        self._cond.notify_all()
+
+    def put(self, article_info: Dict):
+        """Queue an article, blocking while `capacity` articles are already waiting."""
+        with self._cond:
+            while self._queued >= self.capacity:
+                self._cond.wait()
+            self._push(article_info, 0.0)
+
+    def close(self):
+        """No more articles will be put; workers stop once everything has drained."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def get(self):
+        """Block until some domain may be fetched; returns `_STOP` once drained and closed."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                best, best_ready, wait = None, None, None
+                for state in self._domains.values():
+                    if not state.heap or state.in_flight >= max(1, int(state.limit)):
+                        continue
+                    ready_at = max(state.next_time, state.heap[0][0])
+                    if ready_at <= now:
+                        if best is None or (state.priority, ready_at) < (best.priority, best_ready):
+                            best, best_ready = state, ready_at
+                    else:
+                        wait = ready_at - now if wait is None else min(wait, ready_at - now)
+                if best is not None:
+                    _, _, article_info = heapq.heappop(best.heap)
+                    best.in_flight += 1
+                    best.next_time = now + best.delay
+                    self._queued -= 1
+                    self._outstanding += 1
+                    self._cond.notify_all()
+                    return article_info
+                if self._closed and self._queued == 0 and self._outstanding == 0:
+                    return _STOP
+                self._cond.wait(timeout=wait)
+
+    def done(self, article_info: Dict, latency: float, signal: Optional[str], succeeded: bool):
+        """Record a finished fetch and adapt the domain's concurrency limit and delay."""
+        with self._cond:
+            state = self._state(article_domain(article_info))
+            state.in_flight -= 1
+            state.completed += 1
+            if signal in ('throttled', 'timeout'):
+                state.throttled += 1
+                state.limit = max(1.0, state.limit / 2)
+                state.delay = min(self.max_delay, max(state.delay * 2, self.min_delay))
+            elif succeeded and latency <= self.target_latency:
+                state.limit = min(self.max_concurrency, state.limit + DOMAIN_INCREASE_STEP)
+                state.delay = max(self.min_delay, state.delay / 2)
+            self._cond.notify_all()
+
+    def requeue(self, article_info: Dict, delay: float = 0.0):
+        """Put an article that was taken with `get` back into its domain queue."""
+        with self._cond:
+            self._outstanding -= 1
+            self._push(article_info, time.monotonic() + delay)
+
+    def retry(self, article_info: Dict, signal: Optional[str]) -> bool:
+        """Re-queue a transient failure with backoff instead of sleeping; False if not retryable."""
+        url = article_info['url']
+        if signal not in ('throttled', 'timeout'):
+            return False
+        domain = article_domain(article_info)
+        with self._cond:
+            exhausted = self._retries[url] >= self.max_retries
+            if not exhausted:
+                self._retries[url] += 1
+                backoff = min(2 ** self._retries[url] + random.uniform(0, 1), self.max_delay)
+        if exhausted:
+            METRICS.inc('fetch_retries_exhausted_total', domain=domain, signal=signal)
+            return False
+        METRICS.inc('fetch_retries_total', domain=domain, signal=signal)
+        logger.info(f"Rescheduling {url[:70]} in {backoff:.1f}s ({signal})")
+        self.requeue(article_info, backoff)
+        return True
+
+    def complete(self, article_info: Dict):
+        """Mark an article taken with `get` as fully processed."""
+        with self._cond:
+            self._outstanding -= 1
+            self._cond.notify_all()
+
+    def domain_stats(self) -> Dict[str, Dict]:
+        with self._cond:
+            return {domain: {'limit': round(state.limit, 2), 'delay': round(state.delay, 2),
+                             'completed': state.completed, 'throttled': state.throttled,
+                             'priority': state.priority}
+                    for domain, state in self._domains.items()}
+
+class CrawlPipeline:
+    """Long-lived pipeline: URL scheduler -> fetch threads -> parser processes -> result queue.
+
+    Producers call `submit` (which blocks when the scheduler already holds
+    `queue_size` URLs) and `finish` once they are done; the consumer iterates
+    over `results()` as articles complete, so no worker ever waits for a slower
+    sibling and a slow domain only holds back its own queue. Fetch threads only
+    download HTML; parsing runs in a separate, independently sized process pool.
+    """
+
+    def __init__(self, pool: DriverPool, max_workers: int = MAX_WORKERS,
+                 queue_size: int = WORK_QUEUE_SIZE, parse_processes: int = PARSE_PROCESSES,
+                 parse_queue_size: int = PARSE_QUEUE_SIZE):
+        self.pool = pool
+        self.max_workers = max_workers
+        self.scheduler = DomainScheduler(capacity=queue_size)
+        self.parser = ParseStage(parse_processes, parse_queue_size)
+        self.result_queue = queue.Queue()
+        self._threads = []
+        self._escalated = set()
+
+    def start(self):
+        for i in range(self.max_workers):
+            thread = threading.Thread(target=self._worker, name=f"fetch-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _worker(self):
+        while True:
+            article_info = self.scheduler.get()
+            if article_info is _STOP:
+                self.result_queue.put(_STOP)
+                return
+            try:
+                self._process(article_info)
+            except Exception as e:
+                logger.error(f"A fetch task failed: {e}")
+                self._finish(article_info, None)
+
+    def _process(self, article_info: Dict):
+        """Fetch one article with the tier it is due for and hand the HTML to the parser."""
+        url = article_info['url']
+        tier, html, signal = 'selenium', None, None
+        started = time.monotonic()
+        try:
+            if url not in self._escalated and ENABLE_HTTP_FIRST:
+                tier = DOMAIN_STATS.preferred_tier(article_domain(article_info)) if DOMAIN_STATS is not None else 'http'
+            if FRONTIER is not None and url not in self._escalated:
+                FRONTIER.start_attempt(url)
+            
+            reset_fetch_signal()
+            started = time.monotonic()
+            if tier == 'http':
+                html = fetch_article_with_http(article_info)
+            else:
+                html = fetch_article_with_selenium(article_info, self.pool)
+            signal = current_fetch_signal()
+        finally:
+            # Slot domain selalu dilepas, juga jika pemilihan tier/frontier/fetch melempar exception
+            latency = time.monotonic() - started
+            self.scheduler.done(article_info, latency, signal, html is not None)
+        METRICS.observe('phase_seconds', latency, phase='fetch')
+        METRICS.observe('fetch_seconds', latency, domain=article_domain(article_info), tier=tier)
+        
+        if isinstance(html, dict):
+            record_fetch_tier('selenium_js')
+            record_domain_outcome(article_info, tier, True, latency, html)
+            logger.info(f"Successfully processed (in-browser): {url[:70]}")
+            self._finish(article_info, html)
+            return
+        if html is None:
+            record_domain_outcome(article_info, tier, False, latency, reason=signal or 'fetch_failed')
+            if tier == 'http':
+                self._escalate(article_info)
+            elif not self.scheduler.retry(article_info, signal):
+                self._finish(article_info, None)
+            return
+        
+        note_html_fetched(article_info, html)
+        self.parser.submit(article_info, html, lambda future: self._parsed(article_info, tier, latency, future))
+
+    def _parsed(self, article_info: Dict, tier: str, latency: float, future: Future):
+        """Parse callback; exceptions here would be swallowed by concurrent.futures, so none may escape."""
+        try:
+            self._handle_parsed(article_info, tier, latency, future)
+        except Exception as e:
+            logger.error(f"Handling parse result failed for {article_info['url'][:70]}: {e}")
+            self._finish(article_info, None)
+
+    def _handle_parsed(self, article_info: Dict, tier: str, latency: float, future: Future):
+        url = article_info['url']
+        try:
+            result, reason = future.result()
+        except Exception as e:
+            logger.error(f"Error parsing {url[:70]}: {e}")
+            result, reason = None, 'parse_error'
+        record_domain_outcome(article_info, tier, bool(result), latency, result, reason)
+        
+        if result:
+            record_fetch_tier(tier)
+            logger.info(f"Successfully processed ({tier}): {url[:70]}")
+            self._finish(article_info, result)
+        elif tier == 'http':
+            logger.debug(f"HTTP tier result rejected, escalating to Selenium: {url[:70]}")
+            self._escalate(article_info)
+        else:
+            logger.warning(f"Article failed validation ({reason}): {url[:70]}")
+            self._finish(article_info, None)
+
+    def _escalate(self, article_info: Dict):
+        self._escalated.add(article_info['url'])
+        self.scheduler.requeue(article_info)
+
+    def _finish(self, article_info: Dict, result: Optional[Dict]):
+        url = article_info['url']
+        self._escalated.discard(url)
+        try:
+            if not result:
+                record_fetch_tier('failed')
+            METRICS.inc('articles_total', outcome='validated' if result else 'failed')
+            # 'validated' is recorded by the consumer once the row is persisted (see mark_persisted)
+            if FRONTIER is not None and not result:
+                FRONTIER.mark_failed(url)
+        except Exception as e:
+            logger.error(f"Could not record outcome for {url[:70]}: {e}")
+        finally:
+            self.result_queue.put((article_info, result))
+            self.scheduler.complete(article_info)
+
+    def submit(self, article_info: Dict):
+        if DOMAIN_STATS is not None and DOMAIN_STATS.should_skip(article_domain(article_info)):
+            logger.debug(f"Skipping chronically failing domain: {article_info['url'][:70]}")
+            if FRONTIER is not None:
+                FRONTIER.mark_skipped(article_info['url'])
+            return
+        self.scheduler.put(article_info)
+
+    def finish(self):
+        """Signal that no more URLs will be submitted."""
+        self.scheduler.close()
+
+    def feed(self, articles: Iterable[Dict]):
+        """Submit every article from an iterable, then finish (run it in a producer thread)."""
+        try:
+            for article_info in articles:
+                self.submit(article_info)
+        except Exception as e:
+            logger.error(f"Producer failed: {e}")
+        finally:
+            self.finish()
+
+    @staticmethod
+    def mark_persisted(article_info: Dict, result: Dict):
+        """Consumer side: mark a result validated in the frontier only after it has been saved,
+        so a crash between the fetch threads and the checkpoint re-offers the URL next run."""
+        if FRONTIER is not None:
+            FRONTIER.mark_validated(article_info['url'], result['content_hash'])
+
+    def results(self) -> Iterator[Tuple[Dict, Optional[Dict]]]:
+        """Yield (article_info, result) pairs as they complete until all workers exit."""
+        remaining = len(self._threads)
+        while remaining:
+            item = self.result_queue.get()
+            if item is _STOP:
+                remaining -= 1
+                continue
+            yield item
+
+    def close(self):
+        self.parser.close()
+
+def process_articles_batch(articles: List[Dict], max_workers: int = MAX_WORKERS,
+                           pool: Optional[DriverPool] = None) -> List[Dict]:
+    """Process a fixed list of articles through a CrawlPipeline and collect the results."""
     results = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_article = {executor.submit(analyze_article_with_selenium, article): article for article in articles}
-        with tqdm(total=len(articles), desc="Processing articles") as pbar:
-            for future in as_completed(future_to_article):
-                try:
-                    result = future.result(timeout=TIMEOUT + 10)
-                    if result:
-                        results.append(result)
-                except Exception as e:
-                    logger.error(f"A task in the batch failed: {e}")
-                finally:
-                    pbar.update(1)
+    own_pool = pool is None
+    if own_pool:
+        pool = DriverPool(size=max_workers)
+    pipeline = CrawlPipeline(pool, max_workers=max_workers)
+    pipeline.start()
+    threading.Thread(target=pipeline.feed, args=(articles,), name="producer", daemon=True).start()
+    with tqdm(total=len(articles), desc="Processing articles") as pbar:
+        for article_info, result in pipeline.results():
+            if result:
+                results.append(result)
+                pipeline.mark_persisted(article_info, result)
+            pbar.update(1)
+    pipeline.close()
+    if own_pool:
+        pool.close()
     return results
 
-def deduplicate_results(results: List[Dict]) -> List[Dict]:
-    """Remove duplicate articles based on content hash and URL."""
+def iter_scouted_articles(keywords: List[str], start_date: str, end_date: str) -> Iterator[Dict]:
+    """Phase 1 as a stream: scout every (keyword, date window) shard concurrently.
+
+    Requests to Google News share GOOGLE_NEWS_LIMITER (also used by UrlResolver) so
+    it sees at most one request per SCOUT_MIN_INTERVAL; scout-cache hits skip it; results are URL-deduplicated and yielded as each shard finishes.
+    """
+    shards = [(keyword, ws, we) for keyword in keywords for ws, we in date_windows(start_date, end_date)]
+    logger.info(f"Scouting {len(shards)} shards ({len(keywords)} keywords, window={SCOUT_WINDOW})")
+    def run_shard(shard: Tuple[str, str, str]) -> List[Dict]:
+        with METRICS.timer('phase_seconds', phase='scout'):
+            return scout_with_pygooglenews(*shard) or []
+    
+    seen_urls = set()
+    total_found = 0
+    executor = ThreadPoolExecutor(max_workers=SCOUT_WORKERS, thread_name_prefix="scout")
+    try:
+        futures = [executor.submit(run_shard, shard) for shard in shards]
+        for future in as_completed(futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                logger.error(f"A scouting shard failed: {e}")
+                continue
+            total_found += len(results)
+            for article in results:
+                if article['url'] not in seen_urls:
+                    seen_urls.add(article['url'])
+                    yield article
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    logger.info(f"Phase 1 complete: Found {total_found} potential articles, "
+                f"{len(seen_urls)} unique after URL deduplication")
+
+def iter_resolved_articles(articles: Iterable[Dict], resolver: UrlResolver,
+                           workers: int = RESOLVE_WORKERS) -> Iterator[Dict]:
+    """Resolve scouted articles to canonical URLs concurrently and drop canonical duplicates."""
+    seen_canonical = set()
+    duplicates = 0
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="resolve")
+    pending = set()
+    
+    def emit(done) -> Iterator[Dict]:
+        nonlocal duplicates
+        for future in done:
+            try:
+                article = future.result()
+            except Exception as e:
+                logger.error(f"URL resolution failed: {e}")
+                continue
+            if article['url'] in seen_canonical:
+                duplicates += 1
+                continue
+            seen_canonical.add(article['url'])
+            yield article
+    
+    try:
+        for article in articles:
+            pending.add(executor.submit(resolver.resolve_article, article))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from emit(done)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from emit(done)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    logger.info(f"URL resolution: {len(seen_canonical)} distinct canonical URLs, "
+                f"{duplicates} duplicates dropped, stats={dict(resolver.stats)}")
+
+def iter_frontier_articles(frontier: UrlFrontier, keywords: List[str], start_date: str, end_date: str,
+                           resolver: Optional[UrlResolver] = None) -> Iterator[Dict]:
+    """Yield leftovers from interrupted runs first, then newly scouted or retry-eligible URLs."""
+    queued = set()
+    leftovers = frontier.pending()
+    if leftovers:
+        logger.info(f"Resuming {len(leftovers)} pending URLs from the frontier")
+    for article in leftovers:
+        queued.add(article['url'])
+        yield article
+    
+    skipped = 0
+    scouted = iter_scouted_articles(keywords, start_date, end_date)
+    if resolver is not None:
+        def unsettled(articles: Iterable[Dict]) -> Iterator[Dict]:
+            # Link yang tidak ter-resolve disimpan di frontier apa adanya: cek dulu sebelum request resolusi
+            nonlocal skipped
+            for article in articles:
+                if frontier.is_settled(article['url']):
+                    skipped += 1
+                else:
+                    yield article
+        scouted = iter_resolved_articles(unsettled(scouted), resolver)
+    for article in scouted:
+        if article['url'] in queued:
+            continue
+        if frontier.add_scouted(article):
+            queued.add(article['url'])
+            yield article
+        else:
+            skipped += 1
+    logger.info(f"Frontier skipped {skipped} URLs already validated or out of retries")
+
+def iter_leased_articles(frontier: UrlFrontier, owner: str, batch_size: int = LEASE_BATCH_SIZE,
+                         poll_interval: float = LEASE_POLL_SECONDS) -> Iterator[Dict]:
+    """Worker producer: lease batches from the shared frontier until the coordinator is done
+    scouting and no URL is left eligible or under another worker's live lease.
+
+    Leases are renewed from a separate thread every `lease_seconds / 3`: this
+    generator spends most of its time blocked in `scheduler.put`, and URLs queued
+    behind a slow domain must not lose their lease to another worker meanwhile.
+    """
+    leased = 0
+    stop_renewing = threading.Event()
+    
+    def renew():
+        while not stop_renewing.wait(frontier.lease_seconds / 3):
+            try:
+                frontier.renew_leases(owner)
+            except Exception as e:
+                logger.warning(f"Could not renew leases for {owner}: {e}")
+    
+    threading.Thread(target=renew, name="lease-renewer", daemon=True).start()
+    try:
+        while True:
+            batch = frontier.lease(owner, batch_size)
+            if batch:
+                leased += len(batch)
+                yield from batch
+                continue
+            if frontier.scouting_done() and not frontier.has_open_work():
+                break
+            time.sleep(poll_interval)
+    finally:
+        stop_renewing.set()
+    logger.info(f"Worker {owner} leased {leased} URLs from the shared frontier")
+
+def run_coordinator(frontier: UrlFrontier, keywords: List[str], start_date: str, end_date: str,
+                    resolver: Optional[UrlResolver] = None, poll_interval: float = LEASE_POLL_SECONDS):
+    """Scout into the shared frontier, then wait until the workers have drained it."""
+    frontier.set_scouting_done(False)
+    frontier.reset_skipped()
+    queued = sum(1 for _ in iter_frontier_articles(frontier, keywords, start_date, end_date, resolver))
+    frontier.set_scouting_done(True)
+    logger.info(f"Coordinator queued {queued} URLs; waiting for workers")
+    while frontier.has_open_work():
+        logger.info(f"Frontier state counts: {frontier.counts()}")
+        time.sleep(poll_interval)
+
+def deduplicate_results(results: List[Dict],
+                        near_duplicate_threshold: Optional[float] = NEAR_DUPLICATE_THRESHOLD) -> List[Dict]:
+    """Remove duplicate articles based on content hash, URL and (optionally) MinHash similarity."""
     seen_hashes, seen_urls, unique_results = set(), set(), []
+    near_index = NearDuplicateIndex(near_duplicate_threshold) if near_duplicate_threshold else None
     for result in results:
         content_hash, url = result.get('content_hash'), result.get('url')
-        if content_hash not in seen_hashes and url not in seen_urls:
+        if (content_hash not in seen_hashes and url not in seen_urls
+                and not (near_index and near_index.add(url, result.get('teks_berita', '')))):
             seen_hashes.add(content_hash)
             seen_urls.add(url)
             unique_results.append(result)
@@ -227,16 +2061,209 @@ def deduplicate_results(results: List[Dict]) -> List[Dict]:
             logger.debug(f"Duplicate removed: {url[:70]}")
     return unique_results
 
-def save_checkpoint(data: List[Dict], checkpoint_name: str = "checkpoint"):
-    """Save intermediate results as checkpoint."""
-    if data:
-        df = pd.DataFrame(data)
-        output_dir = os.path.join('data', 'raw')
-        os.makedirs(output_dir, exist_ok=True)
-        filename = f"{checkpoint_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        filepath = os.path.join(output_dir, filename)
-        df.to_csv(filepath, index=False, encoding='utf-8-sig')
-        logger.info(f"Checkpoint saved: {filepath}")
+class NearDuplicateIndex:
+    """Incremental MinHash-LSH index over article text.
+
+    Texts are split into word shingles and summarised by a MinHash signature;
+    LSH banding finds candidate matches and the estimated Jaccard similarity
+    of each candidate is checked against `threshold`.
+    """
+
+    _PRIME = (1 << 31) - 1
+
+    def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD, num_perm: int = MINHASH_NUM_PERM,
+                 shingle_size: int = SHINGLE_SIZE, seed: int = 1):
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, self._PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, self._PRIME, size=num_perm).astype(np.uint64)
+        self.rows = self._choose_rows(threshold, num_perm)
+        self.bands = num_perm // self.rows
+        self._buckets = [defaultdict(list) for _ in range(self.bands)]
+        self._signatures = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _choose_rows(threshold: float, num_perm: int) -> int:
+        """Largest rows-per-band whose LSH threshold (1/b)^(1/r) stays below `threshold`."""
+        rows = 1
+        for r in range(1, num_perm + 1):
+            if num_perm % r == 0 and (1 / (num_perm // r)) ** (1 / r) <= threshold:
+                rows = r
+        return rows
+
+    def _shingles(self, text: str) -> set:
+        words = re.findall(r'\w+', text.lower())
+        if len(words) <= self.shingle_size:
+            return {' '.join(words)} if words else set()
+        return {' '.join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        shingles = self._shingles(text or '')
+        if not shingles:
+            return None
+        hashes = np.fromiter((zlib.crc32(sh.encode()) for sh in shingles), dtype=np.uint64, count=len(shingles))
+        return ((np.outer(hashes, self._a) + self._b) % self._PRIME).min(axis=0)
+
+    def add(self, key: str, text: str) -> Optional[str]:
+        """Index `text` under `key`; return the key of an existing near-duplicate instead, if any."""
+        sig = self.signature(text)
+        if sig is None:
+            return None
+        band_keys = [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+        with self._lock:
+            checked = set()
+            for bucket, band_key in zip(self._buckets, band_keys):
+                for candidate in bucket.get(band_key, ()):
+                    if candidate in checked:
+                        continue
+                    checked.add(candidate)
+                    if np.mean(self._signatures[candidate] == sig) >= self.threshold:
+                        return candidate
+            self._signatures[key] = sig
+            for bucket, band_key in zip(self._buckets, band_keys):
+                bucket[band_key].append(key)
+        return None
+
+class CheckpointSink:
+    """Append-only JSONL checkpoint: each validated article is written exactly once.
+
+    Every `append` costs one line of I/O and is flushed immediately, so a crash
+    loses at most the article in flight. The final export is built from `read_all`.
+    """
+
+    def __init__(self, path: str = CHECKPOINT_PATH, resume: bool = RESUME_FROM_CHECKPOINT):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not resume and os.path.exists(path):
+            os.remove(path)
+        self.count = len(self.read_all())
+        self._file = open(path, 'a', encoding='utf-8')
+        if self._file.tell() and not self._ends_with_newline():
+            self._file.write('\n')
+        self._lock = threading.Lock()
+        if self.count:
+            logger.info(f"Resuming from checkpoint {path}: {self.count} articles already saved")
+
+    def append(self, result: Dict):
+        line = json.dumps(result, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            self.count += 1
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def read_all(self) -> List[Dict]:
+        """Load every row written so far, skipping a torn last line after a crash."""
+        return read_checkpoint_file(self.path)
+
+    def close(self):
+        self._file.close()
+
+def read_checkpoint_file(path: str) -> List[Dict]:
+    rows = []
+    if not os.path.exists(path):
+        return rows
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping corrupt checkpoint line in {path}")
+    return rows
+
+def read_all_checkpoints(directory: str = os.path.join(SHARED_DIR, 'raw'),
+                         name: str = NAMA_FILE_OUTPUT) -> List[Dict]:
+    """Rows from every checkpoint of this crawl: the standalone file plus one file per worker."""
+    rows = []
+    for path in sorted(glob.glob(os.path.join(directory, f"{glob.escape(name)}_checkpoint*.jsonl"))):
+        rows.extend(read_checkpoint_file(path))
+    return rows
+
+def reparse_from_cache(cache: HtmlCache) -> List[Dict]:
+    """Rebuild validated article rows from cached HTML alone, without any network access."""
+    results, rejected = [], Counter()
+    lock = threading.Lock()
+    
+    def collect(article_info: Dict, future: Future):
+        try:
+            result, reason = future.result()
+        except Exception as e:
+            logger.error(f"Error reparsing {article_info['url'][:70]}: {e}")
+            result, reason = None, 'parse_error'
+        with lock:
+            if result:
+                results.append(result)
+            else:
+                rejected[reason] += 1
+    
+    stage = ParseStage(PARSE_PROCESSES, PARSE_QUEUE_SIZE)
+    for article_info, html in tqdm(cache.iter_entries(), total=len(cache), desc="Reparsing cached HTML"):
+        stage.submit(article_info, html, lambda future, info=article_info: collect(info, future))
+    stage.close()
+    logger.info(f"Reparse complete: {len(results)} valid, {sum(rejected.values())} rejected "
+                f"by validation {dict(rejected)}")
+    return results
+
+def export_results(final_results: List[Dict]) -> Optional[pd.DataFrame]:
+    """Phase 4: save deduplicated articles to CSV and Excel and print summary statistics."""
+    if not final_results:
+        logger.error("No articles successfully processed")
+        return None
+    
+    for result in final_results:
+        result.pop('content_hash', None)
+    
+    df = pd.DataFrame(final_results)
+    
+    # --- PERBAIKAN DI SINI ---
+    # 1. Konversi semua tanggal ke UTC (menyeragamkan data)
+    # 2. Hapus informasi timezone agar bisa disimpan ke Excel
+    df['tanggal_publikasi'] = pd.to_datetime(df['tanggal_publikasi'], errors='coerce', utc=True).dt.tz_localize(None)
+    # -------------------------
+    
+    # Lanjutkan dengan mengurutkan data
+    df = df.sort_values(by='tanggal_publikasi', ascending=False)
+    
+    output_dir = os.path.join('data', 'raw')
+    os.makedirs(output_dir, exist_ok=True)
+    
+    csv_path = os.path.join(output_dir, f"{NAMA_FILE_OUTPUT}.csv")
+    excel_path = os.path.join(output_dir, f"{NAMA_FILE_OUTPUT}.xlsx")
+
+    # Save to CSV
+    df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+    
+    # Save to Excel
+    with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name='Articles', index=False)
+        worksheet = writer.sheets['Articles']
+        for column in df:
+            column_length = max(df[column].astype(str).map(len).max(), len(column))
+            col_idx = df.columns.get_loc(column)
+            worksheet.column_dimensions[chr(65 + col_idx)].width = min(column_length + 2, 50)
+    
+    logger.info("="*60)
+    logger.info(f"✅ SUCCESS! Processed {len(df)} articles")
+    logger.info(f"📁 Saved to: {csv_path} and {excel_path}")
+    
+    print("\n📊 Summary Statistics:")
+    print(f"  - Total articles: {len(df)}")
+    print(f"  - Articles by source: \n{df['sumber'].value_counts().head(10)}")
+    print(f"  - Articles by keyword: \n{df['keyword_pencarian'].value_counts()}")
+    return df
+
+def dedup_and_export(rows: List[Dict]) -> Optional[pd.DataFrame]:
+    """Phase 4 with per-phase timings: deduplicate the rows, then export them."""
+    with METRICS.timer('phase_seconds', phase='dedup'):
+        final_results = deduplicate_results(rows)
+    with METRICS.timer('phase_seconds', phase='export'):
+        return export_results(final_results)
 
 # =================================================
 # MAIN SCRIPT
@@ -250,85 +2277,115 @@ if __name__ == "__main__":
     logger.info(f"Article limit per keyword: {LIMIT_ARTICLES_PER_KEYWORD}")
     logger.info("="*60)
     
-    # PHASE 1: Scouting
-    all_potential_articles = []
-    for i, keyword in enumerate(SEARCH_KEYWORDS):
-        results = scout_with_pygooglenews(keyword, START_DATE, END_DATE)
-        if results:
-            all_potential_articles.extend(results)
-        if i < len(SEARCH_KEYWORDS) - 1:
-            delay = random.uniform(BASE_DELAY, BASE_DELAY + 2)
-            logger.debug(f"Waiting {delay:.2f} seconds before next search...")
-            time.sleep(delay)
+    HTML_CACHE = HtmlCache(HTML_CACHE_DIR, max_mb=HTML_CACHE_MAX_MB)
+    if REPARSE_FROM_CACHE:
+        logger.info(f"Reparse mode: rebuilding dataset from {len(HTML_CACHE)} cached pages")
+        dedup_and_export(reparse_from_cache(HTML_CACHE))
+        HTML_CACHE.close()
+        export_metrics()
+        logger.info(f"⏱️ Total time: {time.time() - start_time:.2f}s")
+        exit()
     
-    logger.info(f"Phase 1 complete: Found {len(all_potential_articles)} potential articles")
+    if CRAWL_MODE == 'coordinator':
+        # Distributed mode: scout into the shared frontier, export once the workers have drained it
+        logger.info(f"Coordinator mode: shared frontier at {FRONTIER_PATH}")
+        FRONTIER = UrlFrontier(FRONTIER_PATH, shared=True)
+        resolver = UrlResolver(RESOLVE_CACHE_PATH) if RESOLVE_CANONICAL_URLS else None
+        SCOUT_CACHE = ScoutCache(SCOUT_CACHE_PATH) if ENABLE_SCOUT_CACHE else None
+        try:
+            run_coordinator(FRONTIER, SEARCH_KEYWORDS, START_DATE, END_DATE, resolver)
+        finally:
+            logger.info(f"Frontier state counts: {FRONTIER.counts()}")
+            FRONTIER.close()
+            HTML_CACHE.close()
+            if resolver is not None:
+                resolver.close()
+            if SCOUT_CACHE is not None:
+                SCOUT_CACHE.close()
+        logger.info("Performing final deduplication across worker checkpoints...")
+        dedup_and_export(read_all_checkpoints())
+        export_metrics()
+        logger.info(f"⏱️ Total time: {time.time() - start_time:.2f}s")
+        exit()
     
-    unique_articles_map = {article['url']: article for article in all_potential_articles}
-    unique_articles_list = list(unique_articles_map.values())
-    logger.info(f"After URL deduplication: {len(unique_articles_list)} unique articles")
+    # PHASE 1-3: Scouting feeds the fetch workers continuously
+    logger.info("Starting scouting and article analysis pipeline...")
+    sink = CheckpointSink(CHECKPOINT_PATH, resume=RESUME_FROM_CHECKPOINT)
+    near_index = NearDuplicateIndex(NEAR_DUPLICATE_THRESHOLD) if NEAR_DUPLICATE_THRESHOLD else None
+    if near_index:
+        for row in read_all_checkpoints():
+            near_index.add(row['url'], row.get('teks_berita', ''))
+    near_duplicates = 0
+    resolver = None
+    if CRAWL_MODE == 'worker':
+        logger.info(f"Worker mode: {WORKER_ID} leasing from {FRONTIER_PATH}")
+        FRONTIER = UrlFrontier(FRONTIER_PATH, shared=True)
+        pending_articles = iter_leased_articles(FRONTIER, WORKER_ID)
+        queue_size = LEASE_BATCH_SIZE
+    else:
+        FRONTIER = UrlFrontier(FRONTIER_PATH)
+        resolver = UrlResolver(RESOLVE_CACHE_PATH) if RESOLVE_CANONICAL_URLS else None
+        SCOUT_CACHE = ScoutCache(SCOUT_CACHE_PATH) if ENABLE_SCOUT_CACHE else None
+        pending_articles = iter_frontier_articles(FRONTIER, SEARCH_KEYWORDS, START_DATE, END_DATE, resolver)
+        queue_size = WORK_QUEUE_SIZE
     
-    # PHASE 2 & 3: Analysis
-    if not unique_articles_list:
-        logger.warning("No articles to process. Exiting...")
-        exit()
+    DOMAIN_STATS = DomainStatsStore(DOMAIN_STATS_PATH)
     
-    logger.info("Starting article analysis phase...")
-    final_results = []
+    resolve_chromedriver_path()
+    driver_pool = DriverPool(size=MAX_WORKERS)
+    pipeline = CrawlPipeline(driver_pool, max_workers=MAX_WORKERS, queue_size=queue_size)
+    pipeline.start()
+    producer = threading.Thread(target=pipeline.feed, args=(pending_articles,), name="producer", daemon=True)
+    producer.start()
+    try:
+        with tqdm(desc="Processing articles") as pbar:
+            for article_info, result in pipeline.results():
+                pbar.update(1)
+                if not result:
+                    continue
+                duplicate_of = near_index.add(result['url'], result['teks_berita']) if near_index else None
+                if duplicate_of:
+                    near_duplicates += 1
+                    logger.info(f"Near-duplicate of {duplicate_of[:70]} dropped: {result['url'][:70]}")
+                else:
+                    sink.append(result)
+                pipeline.mark_persisted(article_info, result)
+    finally:
+        sink.close()
+        pipeline.close()
+        driver_pool.close()
+        logger.info(f"Frontier state counts: {FRONTIER.counts()}")
+        logger.info(f"Near-duplicates dropped during crawl: {near_duplicates}")
+        FRONTIER.close()
+        HTML_CACHE.close()
+        if resolver is not None:
+            resolver.close()
+        if SCOUT_CACHE is not None:
+            logger.info(f"Scout cache stats: {dict(SCOUT_CACHE.stats)}")
+            SCOUT_CACHE.close()
+        logger.info(f"Driver pool stats: {driver_pool.stats}")
+        logger.info(f"Fetch tier stats: {dict(FETCH_TIER_STATS)}")
+        logger.info(f"Per-domain scheduler state: {pipeline.scheduler.domain_stats()}")
+        logger.info(f"Per-domain fetch history: {DOMAIN_STATS.summary()}")
+        if DOMAIN_STATS.skipped:
+            logger.info(f"URLs skipped for chronically failing domains: {dict(DOMAIN_STATS.skipped)}")
+        DOMAIN_STATS.close()
+        if MEASURE_BLOCKING:
+            log_blocking_savings()
     
-    for i in range(0, len(unique_articles_list), BATCH_SIZE):
-        batch = unique_articles_list[i:i+BATCH_SIZE]
-        logger.info(f"Processing batch {i//BATCH_SIZE + 1}/{(len(unique_articles_list)-1)//BATCH_SIZE + 1}")
-        
-        batch_results = process_articles_batch(batch, max_workers=MAX_WORKERS)
-        final_results.extend(batch_results)
-        
-        if (i//BATCH_SIZE + 1) % 5 == 0:
-            save_checkpoint(final_results, "batch_checkpoint")
+    run_summary = {'fetch_tiers': dict(FETCH_TIER_STATS), 'driver_pool': driver_pool.stats,
+                   'near_duplicates_dropped': near_duplicates}
+    if CRAWL_MODE == 'worker':
+        export_metrics(run_summary)
+        logger.info(f"Worker {WORKER_ID} finished: {sink.count} articles in {CHECKPOINT_PATH}; "
+                    f"the coordinator exports the merged dataset")
+        exit()
     
-    # PHASE 4: Final deduplication and saving
+    # PHASE 4: Final deduplication and saving (built from the checkpoint sink)
     logger.info("Performing final deduplication...")
-    final_results = deduplicate_results(final_results)
-    
-    if not final_results:
-        logger.error("No articles successfully processed")
-    else:
-        for result in final_results:
-            result.pop('content_hash', None)
-        
-        df = pd.DataFrame(final_results)
-        
-        # --- PERBAIKAN DI SINI ---
-        # 1. Konversi semua tanggal ke UTC (menyeragamkan data)
-        # 2. Hapus informasi timezone agar bisa disimpan ke Excel
-        df['tanggal_publikasi'] = pd.to_datetime(df['tanggal_publikasi'], errors='coerce', utc=True).dt.tz_localize(None)
-        # -------------------------
-        
-        # Lanjutkan dengan mengurutkan data
-        df = df.sort_values(by='tanggal_publikasi', ascending=False)
-        
-        output_dir = os.path.join('data', 'raw')
-        os.makedirs(output_dir, exist_ok=True)
-        
-        csv_path = os.path.join(output_dir, f"{NAMA_FILE_OUTPUT}.csv")
-        excel_path = os.path.join(output_dir, f"{NAMA_FILE_OUTPUT}.xlsx")
-
-        # Save to CSV
-        df.to_csv(csv_path, index=False, encoding='utf-8-sig')
-        
-        # Save to Excel
-        with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Articles', index=False)
-            worksheet = writer.sheets['Articles']
-            for column in df:
-                column_length = max(df[column].astype(str).map(len).max(), len(column))
-                col_idx = df.columns.get_loc(column)
-                worksheet.column_dimensions[chr(65 + col_idx)].width = min(column_length + 2, 50)
-        
-        logger.info("="*60)
-        logger.info(f"✅ SUCCESS! Processed {len(df)} articles")
-        logger.info(f"📁 Saved to: {csv_path} and {excel_path}")
-        
-        print("\n📊 Summary Statistics:")
-        print(f"  - Total articles: {len(df)}")
-        print(f"  - Articles by source: \n{df['sumber'].value_counts().head(10)}")
-        print(f"  - Articles by keyword: \n{df['keyword_pencarian'].value_counts()}")
\ No newline at end of file
+    df = dedup_and_export(sink.read_all())
+    if df is not None:
+        print(f"  - Articles by fetch tier: http={FETCH_TIER_STATS['http']}, "
+              f"selenium={FETCH_TIER_STATS['selenium']}, selenium_js={FETCH_TIER_STATS['selenium_js']}, "
+              f"failed={FETCH_TIER_STATS['failed']}")
+    export_metrics(run_summary)
@@ -4,11 +4,16 @@ Twitter Crawler v2.1
 - Mampu memproses beberapa kata kunci dalam satu kali jalan.
 - Perbaikan untuk 'tweets_data is not defined'.
 """
-import pandas as pd
 import time
 import os
 import random
-from datetime import datetime
+import json
+import queue
+import csv
+import threading
+from datetime import datetime, timezone
+from http.cookiejar import MozillaCookieJar, Cookie
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # --- Import Selenium ---
 from selenium import webdriver
@@ -18,7 +23,7 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 
 # --- Impor Konfigurasi ---
 try:
@@ -32,8 +37,26 @@ except ImportError:
 # === KONFIGURASI UTAMA ===
 # ==============================================================================
 MAX_TWEETS_TO_SCRAPE = 250
-DELAY_PER_SCROLL = 15
+SCROLL_WAIT_CEILING = 15  # batas maksimal (detik) menunggu tweet baru muncul setelah scroll
+SCROLL_JITTER = (0.5, 2.0)  # jeda acak (detik) setelah tweet baru muncul, agar aman dari rate limit
+# 'dom': baca teks tweet yang dirender; 'network': baca JSON SearchTimeline dari log network Chrome
+# (teks lengkap tanpa "Show more", plus jumlah reply/retweet/like/quote/view)
+COLLECTION_MODE = 'dom'
+HEADLESS = False  # mode 'network' tidak butuh browser yang terlihat
+# --- Sesi login disimpan (format Netscape, seperti cookies.txt) dan dipakai ulang antar run ---
+# Berisi cookie login aktif (auth_token, ct0): simpan di luar git, lihat .gitignore
+SESSION_COOKIES_PATH = os.path.join('data', 'session', 'twitter_cookies.txt')
+TWITTER_COOKIE_DOMAINS = ('x.com', 'twitter.com')
+# --- Beberapa query berjalan bersamaan, masing-masing di driver sendiri dengan sesi yang sama ---
+MAX_CONCURRENT_QUERIES = 3
+QUERY_PAUSE = (5, 15)  # jeda acak (detik) antar query dalam satu driver, dan jarak mulai antar driver
+OUTPUT_COLUMNS = ['keyword_pencarian', 'id', 'username', 'handle', 'timestamp', 'text',
+                  'reply_count', 'retweet_count', 'like_count', 'quote_count', 'view_count']
 NAMA_FILE_OUTPUT = "hasil_crawling_twitter_multi"
+# --- Crawl inkremental: tweet terbaru per query dicatat, run berikutnya berhenti di tweet yang sudah ada ---
+STATE_PATH = os.path.join('data', 'raw', f"{NAMA_FILE_OUTPUT}_state.json")
+HIGH_WATER_STOP_AFTER = 3  # berhenti scroll setelah N tweet lama (<= high-water mark) terlihat
+BACKFILL_MAX_EMPTY_RUNS = 3  # backfill dihapus setelah N run berturut-turut tanpa tweet baru maupun sampai di mark
 # ==============================================================================
 
 def create_driver() -> webdriver.Chrome:
@@ -43,6 +66,13 @@ def create_driver() -> webdriver.Chrome:
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-logging"])
+    if HEADLESS:
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--window-size=1280,2000")
+    if COLLECTION_MODE == 'network':
+        # Log performance berisi event Network.*; gambar tidak perlu dimuat untuk membaca JSON
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
     
     service = Service(ChromeDriverManager().install())
     driver = webdriver.Chrome(service=service, options=chrome_options)
@@ -78,21 +108,342 @@ def login(driver: webdriver.Chrome, username: str, password: str) -> bool:
         print(f"❌ Gagal login: Terjadi error tak terduga - {e}")
         return False
 
-def scrape_tweets(driver: webdriver.Chrome, query: str, max_tweets: int, delay: int) -> list:
-    """Logika utama untuk mencari, scrolling, dan ekstraksi data tweet."""
-    print(f"\n🔎 Memulai pencarian untuk: '{query}'")
-    search_url = f"https://twitter.com/search?q={query.replace(' ', '%20')}&src=typed_query&f=live"
+# Scroll ke bawah lalu tunggu sampai node tweet baru ditambahkan ke DOM (MutationObserver),
+# atau sampai batas waktu habis. Mengembalikan true jika ada tweet baru.
+SCROLL_AND_WAIT_JS = """
+const timeoutMs = arguments[0];
+const done = arguments[arguments.length - 1];
+const SELECTOR = 'article[data-testid="tweet"]';
+let finished = false;
+const observer = new MutationObserver((mutations) => {
+    for (const m of mutations) {
+        for (const node of m.addedNodes) {
+            if (node.nodeType === 1 && (node.matches(SELECTOR) || node.querySelector(SELECTOR))) {
+                finish(true);
+                return;
+            }
+        }
+    }
+});
+const timer = setTimeout(() => finish(false), timeoutMs);
+function finish(result) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done(result);
+}
+observer.observe(document.body, {childList: true, subtree: true});
+window.scrollTo(0, document.body.scrollHeight);
+"""
+
+# Ambil semua tweet yang belum pernah dibaca dalam satu round trip. Artikel yang sudah dibaca
+# ditandai data-crawled, jadi biaya per scroll sebanding dengan jumlah tweet baru saja.
+EXTRACT_NEW_TWEETS_JS = r"""
+const tweets = [];
+for (const article of document.querySelectorAll('article[data-testid="tweet"]:not([data-crawled])')) {
+    const time = article.querySelector('time');
+    const link = time ? time.closest('a[href*="/status/"]') : null;
+    if (!link) continue;  // belum selesai dirender, dicoba lagi pada scroll berikutnya
+    article.setAttribute('data-crawled', '1');
+    const match = link.getAttribute('href').match(/\/([^\/]+)\/status\/(\d+)/);
+    const textEl = article.querySelector('div[data-testid="tweetText"]');
+    if (!match || !textEl) continue;
+    const nameEl = article.querySelector('div[data-testid="User-Name"] span');
+    tweets.push({
+        id: match[2],
+        username: nameEl ? nameEl.innerText : '',
+        handle: match[1],
+        timestamp: time.getAttribute('datetime'),
+        text: textEl.innerText
+    });
+}
+return JSON.stringify(tweets);
+"""
+
+def extract_new_tweets(driver: webdriver.Chrome) -> list:
+    """Satu panggilan execute_script: tweet yang belum dibaca (id, username, handle, timestamp, text)."""
+    return json.loads(driver.execute_script(EXTRACT_NEW_TWEETS_JS))
+
+def is_twitter_cookie(domain: str) -> bool:
+    return domain.lstrip('.').endswith(TWITTER_COOKIE_DOMAINS)
+
+def is_logged_in(driver: webdriver.Chrome, timeout: int = 10) -> bool:
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, 'a[data-testid="SideNav_NewTweet_Button"]'))
+        )
+        return True
+    except TimeoutException:
+        return False
+
+def save_session_cookies(driver: webdriver.Chrome, path: str = SESSION_COOKIES_PATH):
+    """Simpan cookie X/Twitter ke file Netscape; cookie domain lain di file yang sama tetap dipertahankan."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    jar = MozillaCookieJar(path)
+    if os.path.exists(path):
+        jar.load(ignore_discard=True, ignore_expires=True)
+    for cookie in [c for c in jar if is_twitter_cookie(c.domain)]:
+        jar.clear(cookie.domain, cookie.path, cookie.name)
+    for c in driver.get_cookies():
+        expiry = c.get('expiry')
+        jar.set_cookie(Cookie(
+            version=0, name=c['name'], value=c['value'], port=None, port_specified=False,
+            domain=c['domain'], domain_specified=True, domain_initial_dot=c['domain'].startswith('.'),
+            path=c.get('path', '/'), path_specified=True, secure=c.get('secure', False),
+            expires=int(expiry) if expiry else None, discard=expiry is None, comment=None, comment_url=None,
+            rest={'HttpOnly': None} if c.get('httpOnly') else {}
+        ))
+    # File baru dibuat dengan mode 0600 sebelum cookie ditulis; file lama ikut dipersempit sesudahnya
+    os.close(os.open(path, os.O_WRONLY | os.O_CREAT, 0o600))
+    jar.save(ignore_discard=True, ignore_expires=True)
+    os.chmod(path, 0o600)
+    print(f"💾 Sesi login disimpan di '{path}'")
+
+def load_session_cookies(driver: webdriver.Chrome, path: str = SESSION_COOKIES_PATH) -> bool:
+    """Pasang cookie tersimpan ke driver; True jika sesinya masih login."""
+    if not os.path.exists(path):
+        return False
+    jar = MozillaCookieJar(path)
+    jar.load(ignore_discard=True, ignore_expires=True)
+    cookies = [c for c in jar if is_twitter_cookie(c.domain) and not c.is_expired()]
+    if not cookies:
+        return False
+    driver.get("https://x.com/")
+    for c in cookies:
+        cookie = {'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path, 'secure': bool(c.secure)}
+        if c.expires:
+            cookie['expiry'] = int(c.expires)
+        try:
+            driver.add_cookie(cookie)
+        except WebDriverException:
+            continue
+    driver.get("https://x.com/home")
+    return is_logged_in(driver)
+
+def ensure_logged_in(driver: webdriver.Chrome) -> bool:
+    """Pakai sesi tersimpan bila masih berlaku; jika tidak, login penuh lalu simpan sesinya."""
+    if load_session_cookies(driver):
+        print("✅ Sesi login tersimpan masih berlaku, login dilewati.")
+        return True
+    if login(driver, TWITTER_USERNAME, TWITTER_PASSWORD):
+        save_session_cookies(driver)
+        return True
+    return False
+
+def twitter_time_to_iso(created_at: str) -> str:
+    """'Wed Oct 10 20:19:24 +0000 2018' -> '2018-10-10T20:19:24.000Z' (format atribut datetime di DOM)."""
+    parsed = datetime.strptime(created_at, '%a %b %d %H:%M:%S %z %Y').astimezone(timezone.utc)
+    return parsed.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+def tweet_from_result(result: dict):
+    """Ubah satu objek tweet_results.result dari GraphQL menjadi baris tweet (None jika bukan tweet)."""
+    if result.get('__typename') == 'TweetWithVisibilityResults':
+        result = result.get('tweet', {})
+    legacy = result.get('legacy')
+    if not legacy:
+        return None
+    retweeted = legacy.get('retweeted_status_result', {}).get('result')
+    if retweeted:
+        # Sama seperti mode DOM: retweet dicatat sebagai tweet aslinya
+        return tweet_from_result(retweeted)
+    
+    user = result.get('core', {}).get('user_results', {}).get('result', {})
+    user_core, user_legacy = user.get('core', {}), user.get('legacy', {})
+    note_text = result.get('note_tweet', {}).get('note_tweet_results', {}).get('result', {}).get('text')
+    views = result.get('views', {}).get('count')
+    return {
+        'id': result.get('rest_id') or legacy.get('id_str'),
+        'username': user_core.get('name') or user_legacy.get('name', ''),
+        'handle': user_core.get('screen_name') or user_legacy.get('screen_name', ''),
+        'timestamp': twitter_time_to_iso(legacy['created_at']),
+        'text': note_text or legacy.get('full_text', ''),
+        'reply_count': legacy.get('reply_count', 0),
+        'retweet_count': legacy.get('retweet_count', 0),
+        'like_count': legacy.get('favorite_count', 0),
+        'quote_count': legacy.get('quote_count', 0),
+        'view_count': int(views) if views else None,
+    }
+
+def iter_timeline_tweets(payload):
+    """Cari semua item timeline (kunci 'tweet_results') di respons SearchTimeline, di kedalaman mana pun."""
+    if isinstance(payload, dict):
+        for key, value in payload.items():
+            if key == 'tweet_results' and isinstance(value, dict):
+                tweet = tweet_from_result(value.get('result', {}))
+                if tweet:
+                    yield tweet
+            else:
+                yield from iter_timeline_tweets(value)
+    elif isinstance(payload, list):
+        for item in payload:
+            yield from iter_timeline_tweets(item)
+
+class TimelineCapture:
+    """Membaca respons JSON SearchTimeline dari log performance Chrome pada sesi yang sudah login.
+
+    Body diambil lewat Network.getResponseBody setelah Network.loadingFinished,
+    jadi setiap `poll` mengembalikan tweet dari semua halaman hasil yang sudah dimuat.
+    """
+
+    def __init__(self, driver: webdriver.Chrome):
+        self.driver = driver
+        self._pending = set()
+        driver.get_log('performance')  # buang event dari halaman sebelumnya
+
+    def poll(self) -> list:
+        tweets = []
+        for entry in self.driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            params = message.get('params', {})
+            if message.get('method') == 'Network.responseReceived':
+                if 'SearchTimeline' in params.get('response', {}).get('url', ''):
+                    self._pending.add(params['requestId'])
+            elif message.get('method') == 'Network.loadingFinished' and params.get('requestId') in self._pending:
+                self._pending.discard(params['requestId'])
+                try:
+                    body = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': params['requestId']})
+                    tweets.extend(iter_timeline_tweets(json.loads(body['body'])))
+                except (WebDriverException, ValueError) as e:
+                    print(f"   ⚠️ Gagal membaca respons SearchTimeline: {e}")
+        return tweets
+
+def scroll_and_wait_for_tweets(driver: webdriver.Chrome, max_wait: float) -> bool:
+    """Scroll sekali dan tunggu hanya selama tweet baru belum muncul (maksimal max_wait detik)."""
+    driver.set_script_timeout(max_wait + 5)
+    try:
+        return bool(driver.execute_async_script(SCROLL_AND_WAIT_JS, int(max_wait * 1000)))
+    except TimeoutException:
+        return False
+
+class TweetSink:
+    """CSV harian yang ditambah (append) setiap batch tweet terkumpul, aman dipakai beberapa worker.
+
+    Tweet yang sudah ada di file (keyword + id) tidak ditulis ulang saat run diulang di hari yang sama.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        self._seen = set()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not is_new:
+            with open(path, newline='', encoding='utf-8-sig') as f:
+                self._seen = {(row.get('keyword_pencarian'), row.get('id')) for row in csv.DictReader(f)}
+        # BOM hanya ditulis sekali di awal file baru (sama seperti to_csv utf-8-sig sebelumnya)
+        self._file = open(path, 'a', newline='', encoding='utf-8-sig' if is_new else 'utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=OUTPUT_COLUMNS, extrasaction='ignore')
+        if is_new:
+            self._writer.writeheader()
+            self._file.flush()
+
+    def write(self, rows: list):
+        with self._lock:
+            rows = [row for row in rows if (row['keyword_pencarian'], row['id']) not in self._seen]
+            self._seen.update((row['keyword_pencarian'], row['id']) for row in rows)
+            self._writer.writerows(rows)
+            self._file.flush()
+            self.count += len(rows)
+
+    def close(self):
+        self._file.close()
+
+class QueryState:
+    """High-water mark per query (id & timestamp tweet terbaru), disimpan di JSON antar run.
+
+    Jika run berhenti karena MAX_TWEETS_TO_SCRAPE sebelum sampai di high-water mark lama, rentang
+    yang terlewat dicatat sebagai `backfill` (max_id & since_id) dan diselesaikan run berikutnya.
+    """
+
+    def __init__(self, path: str = STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._state = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self._state = json.load(f)
+
+    def since_id(self, query: str):
+        newest = self._state.get(query, {}).get('newest_id')
+        return int(newest) if newest else None
+
+    def backfill(self, query: str):
+        return self._state.get(query, {}).get('backfill')
+
+    def update(self, query: str, tweets: list, complete: bool):
+        """Catat tweet terbaru query ini; dipanggil hanya setelah query selesai agar tidak ada celah.
+
+        complete=False berarti scraping berhenti sebelum sampai di since_id: tweet di antara mark lama
+        dan tweet tertua run ini belum terkumpul, jadi rentang itu disimpan sebagai backfill.
+        """
+        with self._lock:
+            entry = self._state.setdefault(query, {})
+            old_mark = entry.get('newest_id')
+            if tweets:
+                newest = max(tweets, key=lambda t: int(t['id']))
+                if not old_mark or int(newest['id']) > int(old_mark):
+                    entry['newest_id'] = newest['id']
+                    entry['newest_timestamp'] = newest['timestamp']
+                if not complete and old_mark:
+                    oldest = min(int(t['id']) for t in tweets)
+                    entry['backfill'] = {'max_id': str(oldest - 1), 'since_id': old_mark}
+            self._touch(entry)
+
+    def update_backfill(self, query: str, tweets: list, complete: bool):
+        """Majukan backfill ke bawah (max_id), atau hapus jika rentangnya sudah habis.
+
+        Jika tweet di mark lama sudah dihapus, backfill tidak akan pernah 'sampai'; setelah
+        BACKFILL_MAX_EMPTY_RUNS run tanpa tweet baru, rentangnya dianggap habis.
+        """
+        with self._lock:
+            entry = self._state.setdefault(query, {})
+            backfill = entry.get('backfill', {})
+            if tweets:
+                backfill['max_id'] = str(min(int(t['id']) for t in tweets) - 1)
+                backfill['empty_runs'] = 0
+            elif not complete:
+                backfill['empty_runs'] = backfill.get('empty_runs', 0) + 1
+            if complete or backfill.get('empty_runs', 0) >= BACKFILL_MAX_EMPTY_RUNS:
+                entry.pop('backfill', None)
+            self._touch(entry)
+
+    def _touch(self, entry: dict):
+        entry['last_run'] = datetime.now().isoformat()
+        with open(f"{self.path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, ensure_ascii=False, indent=2)
+        os.replace(f"{self.path}.tmp", self.path)
+
+def scrape_tweets(driver: webdriver.Chrome, query: str, max_tweets: int, max_wait: float,
+                  mode: str = COLLECTION_MODE, since_id: int = None, on_batch=None,
+                  max_id: int = None) -> tuple:
+    """Logika utama untuk mencari, scrolling, dan ekstraksi data tweet (dari DOM atau dari JSON network).
+
+    Tweet dengan id <= since_id sudah dikumpulkan run sebelumnya: dilewati, dan scrolling berhenti
+    setelah HIGH_WATER_STOP_AFTER tweet seperti itu. Setiap batch tweet baru diteruskan ke on_batch.
+    max_id membatasi pencarian ke tweet yang lebih lama (operator pencarian `max_id:`), untuk backfill.
+    Mengembalikan (tweets, complete); complete=False jika berhenti karena max_tweets, atau jika
+    since_id diberikan tetapi tweet lama tidak pernah terlihat (mis. X berhenti memuat karena rate
+    limit / "Something went wrong", yang tampak sama seperti akhir halaman).
+    """
+    print(f"\n🔎 Memulai pencarian untuk: '{query}' (mode: {mode})")
+    search_query = f"{query} max_id:{max_id}" if max_id else query
+    search_url = f"https://twitter.com/search?q={search_query.replace(' ', '%20')}&src=typed_query&f=live"
+    extract = TimelineCapture(driver).poll if mode == 'network' else lambda: extract_new_tweets(driver)
     driver.get(search_url)
 
-    # --- PERBAIKAN: Inisialisasi variabel di sini ---
-    tweets_data = []
-    # ---------------------------------------------
-    seen_tweets = set()
+    # Tweet dikumpulkan per status ID, sehingga tweet yang sama tidak tercatat dua kali
+    tweets_by_id = {}
     last_height = driver.execute_script("return document.body.scrollHeight")
     
-    print(f"Mengumpulkan hingga {max_tweets} tweet. Jeda antar scroll: {delay} detik.")
+    print(f"Mengumpulkan hingga {max_tweets} tweet. Tunggu tweet baru maksimal {max_wait} detik per scroll.")
+    if since_id:
+        print(f"Mode inkremental: berhenti di tweet yang sudah ada (id <= {since_id}).")
+    seen_before = 0
+    complete = max_tweets > 0
     
-    while len(tweets_data) < max_tweets:
+    while len(tweets_by_id) < max_tweets:
         try:
             WebDriverWait(driver, 20).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, 'article[data-testid="tweet"]'))
@@ -101,47 +452,99 @@ def scrape_tweets(driver: webdriver.Chrome, query: str, max_tweets: int, delay:
             print("🟡 Tidak ada tweet yang dimuat setelah scroll. Mungkin sudah mencapai akhir.")
             break
 
-        tweet_elements = driver.find_elements(By.CSS_SELECTOR, 'article[data-testid="tweet"]')
-        
-        new_tweets_found = 0
-        for tweet in tweet_elements:
-            try:
-                tweet_text_element = tweet.find_element(By.CSS_SELECTOR, 'div[data-testid="tweetText"]')
-                tweet_text = tweet_text_element.text
-                
-                if tweet_text not in seen_tweets:
-                    seen_tweets.add(tweet_text)
-                    new_tweets_found += 1
-                    
-                    user_handle_element = tweet.find_element(By.CSS_SELECTOR, 'div[data-testid="User-Name"] span')
-                    
-                    tweets_data.append({
-                        "username": user_handle_element.text,
-                        "timestamp": tweet.find_element(By.TAG_NAME, 'time').get_attribute('datetime'),
-                        "text": tweet_text,
-                    })
-                    
-                    if len(tweets_data) >= max_tweets:
-                        break
-            except:
+        new_batch = []
+        for tweet in extract():
+            if not tweet.get('id') or tweet['id'] in tweets_by_id:
                 continue
+            if since_id and int(tweet['id']) <= since_id:
+                seen_before += 1
+                continue
+            tweets_by_id[tweet['id']] = tweet
+            new_batch.append(tweet)
+            if len(tweets_by_id) >= max_tweets:
+                break
+        new_tweets_found = len(new_batch)
+        if new_batch and on_batch:
+            on_batch(new_batch)
 
-        if len(tweets_data) >= max_tweets:
+        if seen_before >= HIGH_WATER_STOP_AFTER:
+            print(f"Sampai di tweet yang sudah dikumpulkan pada run sebelumnya. {len(tweets_by_id)} tweet baru.")
+            break
+        if len(tweets_by_id) >= max_tweets:
             print(f"Target {max_tweets} tweet telah tercapai.")
+            complete = False
             break
             
-        print(f"   -> Ditemukan {new_tweets_found} tweet baru. Total terkumpul: {len(tweets_data)}. Scrolling ke bawah...")
+        print(f"   -> Ditemukan {new_tweets_found} tweet baru. Total terkumpul: {len(tweets_by_id)}. Scrolling ke bawah...")
         
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(delay)
+        loaded = scroll_and_wait_for_tweets(driver, max_wait)
+        time.sleep(random.uniform(*SCROLL_JITTER))
         
         new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
+        if not loaded and new_height == last_height:
             print("Telah mencapai akhir halaman hasil pencarian.")
             break
         last_height = new_height
-        
-    return tweets_data
+    
+    if since_id and not seen_before:
+        complete = False
+    return list(tweets_by_id.values()), complete
+
+def run_query_worker(worker_id: int, queries: queue.Queue, sink: TweetSink, state: QueryState,
+                     driver: webdriver.Chrome = None) -> list:
+    """Ambil query dari antrean sampai habis; driver baru memakai sesi login yang sudah disimpan.
+
+    Tweet langsung ditulis ke sink per batch, dan high-water mark query diperbarui setelah query selesai.
+    Backfill yang tersisa dari run sebelumnya dikerjakan dulu; sisa jatah MAX_TWEETS_TO_SCRAPE
+    dipakai untuk tweet baru di atas high-water mark.
+    """
+    own_driver = driver is None
+    scraped = []
+    try:
+        time.sleep(worker_id * random.uniform(*QUERY_PAUSE))  # mulai berselang agar tidak serentak
+        if own_driver:
+            driver = create_driver()
+            if not load_session_cookies(driver):
+                print(f"❌ Driver {worker_id}: sesi login tersimpan tidak bisa dipakai.")
+                return scraped
+        while True:
+            try:
+                query = queries.get_nowait()
+            except queue.Empty:
+                return scraped
+            print(f"\n{'='*60}")
+            print(f"[driver {worker_id}] MEMPROSES KEYWORD: '{query}'")
+            print(f"{'='*60}")
+            
+            def write_batch(rows: list, query: str = query):
+                for row in rows:
+                    row['keyword_pencarian'] = query
+                sink.write(rows)
+            
+            budget = MAX_TWEETS_TO_SCRAPE
+            backfill = state.backfill(query)
+            if backfill:
+                print(f"Melanjutkan backfill: tweet dengan id {backfill['since_id']} < id <= {backfill['max_id']}.")
+                backfill_data, complete = scrape_tweets(driver, query, budget, SCROLL_WAIT_CEILING,
+                                                        since_id=int(backfill['since_id']), on_batch=write_batch,
+                                                        max_id=int(backfill['max_id']))
+                state.update_backfill(query, backfill_data, complete)
+                scraped.extend(backfill_data)
+                budget -= len(backfill_data)
+            
+            if not state.backfill(query) and budget > 0:
+                scraped_data, complete = scrape_tweets(driver, query, budget, SCROLL_WAIT_CEILING,
+                                                       since_id=state.since_id(query), on_batch=write_batch)
+                state.update(query, scraped_data, complete)
+                scraped.extend(scraped_data)
+            
+            if not queries.empty():
+                delay_antar_keyword = random.uniform(*QUERY_PAUSE)
+                print(f"\n--- [driver {worker_id}] Jeda {delay_antar_keyword:.2f} detik sebelum keyword berikutnya ---")
+                time.sleep(delay_antar_keyword)
+    finally:
+        if own_driver and driver:
+            driver.quit()
 
 # =================================================
 # SCRIPT UTAMA
@@ -149,41 +552,35 @@ def scrape_tweets(driver: webdriver.Chrome, query: str, max_tweets: int, delay:
 if __name__ == "__main__":
     start_time = time.time()
     driver = create_driver()
+    output_path = os.path.join('data', 'raw', f"{NAMA_FILE_OUTPUT}_{datetime.now().strftime('%Y%m%d')}.csv")
+    sink = TweetSink(output_path)
+    state = QueryState(STATE_PATH)
     
     try:
-        if login(driver, TWITTER_USERNAME, TWITTER_PASSWORD):
-            all_scraped_data = []
+        if ensure_logged_in(driver):
+            query_queue = queue.Queue()
+            for query in SEARCH_QUERIES:
+                query_queue.put(query)
             
-            for i, query in enumerate(SEARCH_QUERIES):
-                print(f"\n{'='*60}")
-                print(f"MEMPROSES KEYWORD {i+1}/{len(SEARCH_QUERIES)}: '{query}'")
-                print(f"{'='*60}")
-                
-                scraped_data = scrape_tweets(driver, query, MAX_TWEETS_TO_SCRAPE, DELAY_PER_SCROLL)
-                
-                for row in scraped_data:
-                    row['keyword_pencarian'] = query
-                
-                all_scraped_data.extend(scraped_data)
-                
-                if i < len(SEARCH_QUERIES) - 1:
-                    delay_antar_keyword = random.uniform(20, 40)
-                    print(f"\n--- Jeda {delay_antar_keyword:.2f} detik sebelum lanjut ke keyword berikutnya ---")
-                    time.sleep(delay_antar_keyword)
-
-            if all_scraped_data:
-                df = pd.DataFrame(all_scraped_data)
-                df = df[['keyword_pencarian', 'username', 'timestamp', 'text']]
-                output_dir = os.path.join('data', 'raw')
-                os.makedirs(output_dir, exist_ok=True)
-                filename = f"{NAMA_FILE_OUTPUT}_{datetime.now().strftime('%Y%m%d')}.csv"
-                output_path = os.path.join(output_dir, filename)
-                df.to_csv(output_path, index=False, encoding='utf-8-sig')
-                print(f"\n✅ Selesai! Total {len(df)} tweet dari {len(SEARCH_QUERIES)} keyword disimpan di: '{output_path}'")
+            # Driver yang sudah login dipakai oleh worker pertama; worker lain membuka driver sendiri
+            n_workers = max(1, min(MAX_CONCURRENT_QUERIES, len(SEARCH_QUERIES)))
+            print(f"\n🚀 Menjalankan {len(SEARCH_QUERIES)} keyword dengan {n_workers} driver paralel")
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                futures = [executor.submit(run_query_worker, i, query_queue, sink, state, driver if i == 0 else None)
+                           for i in range(n_workers)]
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"❌ Sebuah worker query gagal: {e}")
+
+            if sink.count:
+                print(f"\n✅ Selesai! Total {sink.count} tweet baru dari {len(SEARCH_QUERIES)} keyword disimpan di: '{output_path}'")
             else:
-                print("\n❌ Tidak ada tweet yang berhasil dikumpulkan dari semua keyword.")
+                print("\n❌ Tidak ada tweet baru yang berhasil dikumpulkan dari semua keyword.")
 
     finally:
+        sink.close()
         print("\nMenutup browser...")
         if driver:
             driver.quit()
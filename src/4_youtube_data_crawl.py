@@ -7,9 +7,15 @@ import pandas as pd
 import os
 from tqdm import tqdm
 import time
+import json
+import random
+import threading
 from datetime import datetime
+from zoneinfo import ZoneInfo
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # --- Import Library Google API ---
+import httplib2
 import googleapiclient.discovery
 import googleapiclient.errors
 
@@ -34,6 +40,19 @@ VIDEO_IDS = [
 ]
 
 NAMA_FILE_OUTPUT = "hasil_crawling_youtube_filtered"
+# --- Beberapa video diambil bersamaan dengan satu client API yang sama ---
+MAX_CONCURRENT_VIDEOS = 8
+API_MAX_RETRIES = 5  # percobaan ulang per halaman saat kena rate limit / error server
+API_BACKOFF_MAX = 60  # batas jeda (detik) backoff bersama
+RETRYABLE_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded', 'backendError', 'internalError'}
+# --- Crawl inkremental: komentar terbaru per video dicatat, run berikutnya berhenti di komentar yang sudah ada ---
+STATE_PATH = os.path.join('data', 'raw', f"{NAMA_FILE_OUTPUT}_state.json")
+# --- Ledger kuota harian (reset tengah malam waktu Pasifik, sama seperti kuota YouTube Data API) ---
+QUOTA_LEDGER_PATH = os.path.join('data', 'raw', f"{NAMA_FILE_OUTPUT}_quota.json")
+DAILY_QUOTA_UNITS = 10000
+QUOTA_RESERVE = 500  # unit yang disisakan untuk keperluan lain di project yang sama
+COMMENT_THREADS_COST = 1  # biaya satu panggilan commentThreads.list
+QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
 
 # Menggabungkan SEMUA keyword (positif, negatif, dan netral) untuk filter relevansi
 RELEVANT_KEYWORDS = set(NEGATIVE_KEYWORDS + POSITIVE_KEYWORDS + NEUTRAL_KEYWORDS)
@@ -46,66 +65,327 @@ def is_comment_relevant(comment_text: str, relevant_keywords: set) -> bool:
     words_in_comment = set(comment_text.lower().split())
     return bool(words_in_comment.intersection(relevant_keywords))
 
-def get_video_comments(api_key: str, video_id: str, relevant_keywords: set) -> list:
-    """Mengambil semua komentar level atas dari satu video YouTube dengan filter relevansi."""
-    print(f"\n🔎 Mengambil komentar dari video ID: {video_id}...")
-    
+def build_youtube_client(api_key: str):
+    """Satu client YouTube untuk semua video; discovery document hanya dibaca sekali."""
     os.environ["OAUTHLIB_INSECURE_TRANSPORT"] = "1"
-    api_service_name = "youtube"
-    api_version = "v3"
-    
+    return googleapiclient.discovery.build(
+        "youtube", "v3", developerKey=api_key, cache_discovery=False)
+
+# httplib2.Http tidak thread-safe: setiap thread memakai koneksi (keep-alive) miliknya sendiri
+_THREAD_HTTP = threading.local()
+
+def thread_http() -> httplib2.Http:
+    if not hasattr(_THREAD_HTTP, 'http'):
+        _THREAD_HTTP.http = httplib2.Http(timeout=30)
+    return _THREAD_HTTP.http
+
+def http_error_reason(error: googleapiclient.errors.HttpError) -> str:
+    """Alasan error dari body respons API, mis. 'commentsDisabled' atau 'quotaExceeded'."""
     try:
-        youtube = googleapiclient.discovery.build(
-            api_service_name, api_version, developerKey=api_key)
-    except Exception as e:
-        print(f"❌ Gagal terhubung ke YouTube API: {e}")
-        return []
+        return json.loads(error.content)['error']['errors'][0]['reason']
+    except (ValueError, KeyError, IndexError, TypeError):
+        return ''
 
-    comments = []
-    skipped_comments = 0
-    next_page_token = None
+class QuotaExhausted(Exception):
+    """Kuota harian API habis; tidak ada gunanya mencoba video lain."""
+
+class QuotaLedger:
+    """Pemakaian unit kuota hari ini (tanggal Pasifik), disimpan di JSON agar run lain di hari yang sama ikut terhitung."""
+
+    def __init__(self, path: str = QUOTA_LEDGER_PATH, daily_limit: int = DAILY_QUOTA_UNITS,
+                 reserve: int = QUOTA_RESERVE):
+        self.path = path
+        self.budget = daily_limit - reserve
+        self._lock = threading.Lock()
+        self._ledger = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self._ledger = json.load(f)
+        self._roll_over()
+
+    def _roll_over(self):
+        today = datetime.now(QUOTA_TIMEZONE).strftime('%Y-%m-%d')
+        if self._ledger.get('date') != today:
+            self._ledger = {'date': today, 'used': 0}
+
+    def remaining(self) -> int:
+        with self._lock:
+            self._roll_over()
+            return max(0, self.budget - self._ledger['used'])
+
+    def acquire(self, units: int) -> bool:
+        """Pesan unit untuk satu panggilan API; False jika anggaran hari ini tidak cukup."""
+        with self._lock:
+            self._roll_over()
+            if self._ledger['used'] + units > self.budget:
+                return False
+            self._ledger['used'] += units
+            return True
+
+    def exhaust(self):
+        """API sudah menolak dengan quotaExceeded: anggap sisa kuota hari ini nol."""
+        with self._lock:
+            self._roll_over()
+            self._ledger['used'] = max(self._ledger['used'], self.budget)
+
+    def save(self):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(f"{self.path}.tmp", 'w', encoding='utf-8') as f:
+                json.dump(self._ledger, f, indent=2)
+            os.replace(f"{self.path}.tmp", self.path)
+
+class VideoState:
+    """State per video: publishedAt komentar terbaru, total thread, run terakhir, dan sisa halaman yang belum diambil.
+
+    `backfill` berisi pageToken lanjutan dan batas `stop_at` dari rantai halaman yang terputus
+    karena kuota; run berikutnya menyelesaikannya dulu sebelum mengambil komentar baru.
+    """
+
+    def __init__(self, path: str = STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._state = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self._state = json.load(f)
+
+    def get(self, video_id: str) -> dict:
+        with self._lock:
+            return dict(self._state.get(video_id, {}))
+
+    def has_backlog(self, video_id: str) -> bool:
+        return bool(self.get(video_id).get('backfill'))
+
+    def can_resume(self, video_id: str) -> bool:
+        """Masih ada halaman tersisa dan terputus karena anggaran kuota, bukan karena error API."""
+        entry = self.get(video_id)
+        return bool(entry.get('backfill')) and not entry.get('last_error')
+
+    def update(self, video_id: str, **fields):
+        with self._lock:
+            entry = self._state.setdefault(video_id, {})
+            entry.update(fields)
+            entry['last_run'] = datetime.now().isoformat()
+
+    def save(self):
+        """Ditulis setelah hasil CSV tersimpan, agar state tidak pernah mendahului data."""
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(f"{self.path}.tmp", 'w', encoding='utf-8') as f:
+                json.dump(self._state, f, ensure_ascii=False, indent=2)
+            os.replace(f"{self.path}.tmp", self.path)
+
+class SharedBackoff:
+    """Backoff yang dipakai bersama semua worker: satu 429/403 rate limit menahan semua request."""
+
+    def __init__(self, max_delay: float = API_BACKOFF_MAX):
+        self.max_delay = max_delay
+        self._resume_at = 0.0
+        self._failures = 0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def failure(self) -> float:
+        with self._lock:
+            self._failures += 1
+            delay = min(2 ** self._failures + random.uniform(0, 1), self.max_delay)
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+            return delay
 
+    def success(self):
+        with self._lock:
+            self._failures = 0
+
+def execute_with_backoff(request, backoff: SharedBackoff, max_retries: int = API_MAX_RETRIES) -> dict:
+    """Jalankan request API di koneksi thread ini; rate limit & error server diulang lewat backoff bersama."""
+    for attempt in range(max_retries + 1):
+        backoff.wait()
+        try:
+            response = request.execute(http=thread_http())
+            backoff.success()
+            return response
+        except googleapiclient.errors.HttpError as e:
+            reason = http_error_reason(e)
+            if reason in ('quotaExceeded', 'dailyLimitExceeded'):
+                raise QuotaExhausted(reason) from e
+            retryable = e.resp.status in (429, 500, 503) or reason in RETRYABLE_REASONS
+            if not retryable or attempt == max_retries:
+                raise
+            delay = backoff.failure()
+            print(f"   -> 🟡 Rate limit / error server ({e.resp.status} {reason}), semua worker jeda {delay:.1f} detik...")
+
+def fetch_comment_pages(youtube, video_id: str, page_token, stop_at, relevant_keywords: set,
+                        backoff: SharedBackoff, ledger: QuotaLedger, page_budget: int) -> dict:
+    """Ambil halaman commentThreads (order=time, terbaru dulu) mulai dari page_token.
+
+    Berhenti di komentar dengan publishedAt <= stop_at (sudah ada dari run sebelumnya), di akhir
+    daftar, atau saat page_budget / kuota habis / error API. `next_token` berisi halaman lanjutan
+    jika terputus, dan `error` berisi HttpError yang memutusnya (jika ada).
+    """
+    result = {'comments': [], 'threads': 0, 'skipped': 0, 'newest': None, 'pages': 0,
+              'next_token': None, 'complete': False, 'error': None}
     while True:
+        if result['pages'] >= page_budget or not ledger.acquire(COMMENT_THREADS_COST):
+            result['next_token'] = page_token
+            return result
         try:
             request = youtube.commentThreads().list(
                 part="snippet",
                 videoId=video_id,
-                maxResults=100, 
-                pageToken=next_page_token
+                maxResults=100,
+                order="time",
+                pageToken=page_token
             )
-            response = request.execute()
-
-            for item in response['items']:
-                comment_snippet = item['snippet']['topLevelComment']['snippet']
-                comment_text = comment_snippet['textOriginal']
-                
-                if is_comment_relevant(comment_text, relevant_keywords):
-                    comments.append({
-                        'video_id': video_id,
-                        'penulis': comment_snippet['authorDisplayName'],
-                        'tanggal': comment_snippet['publishedAt'],
-                        'like_count': comment_snippet['likeCount'],
-                        'teks': comment_text
-                    })
-                else:
-                    skipped_comments += 1
-
-            next_page_token = response.get('nextPageToken')
-            if not next_page_token:
-                break
-
+            response = execute_with_backoff(request, backoff)
+        except QuotaExhausted:
+            ledger.exhaust()
+            print(f"   -> 🟡 Kuota API harian habis saat mengambil {video_id}, dilanjutkan pada run berikutnya.")
+            result['next_token'] = page_token
+            return result
         except googleapiclient.errors.HttpError as e:
-            if e.resp.status == 403:
-                print("   -> 🟡 Peringatan: Komentar dinonaktifkan untuk video ini atau kuota API habis.")
+            result['error'] = e
+            result['next_token'] = page_token
+            return result
+        result['pages'] += 1
+
+        for item in response['items']:
+            comment_snippet = item['snippet']['topLevelComment']['snippet']
+            published = comment_snippet['publishedAt']
+            # publishedAt selalu format ISO UTC ('...Z'), jadi bisa dibandingkan sebagai string
+            if stop_at and published <= stop_at:
+                result['complete'] = True
+                return result
+            result['threads'] += 1
+            if not result['newest'] or published > result['newest']:
+                result['newest'] = published
+            comment_text = comment_snippet['textOriginal']
+            
+            if is_comment_relevant(comment_text, relevant_keywords):
+                result['comments'].append({
+                    'comment_id': item['id'],
+                    'video_id': video_id,
+                    'penulis': comment_snippet['authorDisplayName'],
+                    'tanggal': published,
+                    'like_count': comment_snippet['likeCount'],
+                    'teks': comment_text
+                })
             else:
-                print(f"   -> 💥 Error saat mengambil komentar: {e}")
-            break
+                result['skipped'] += 1
+
+        page_token = response.get('nextPageToken')
+        if not page_token:
+            result['complete'] = True
+            return result
+
+def get_video_comments(youtube, video_id: str, relevant_keywords: set, backoff: SharedBackoff,
+                       state: VideoState, ledger: QuotaLedger, page_budget: int) -> list:
+    """Mengambil komentar level atas yang belum pernah dikumpulkan dari satu video YouTube dengan filter relevansi.
+
+    Sisa rantai halaman dari run sebelumnya (backfill) diselesaikan dulu, lalu komentar baru
+    diambil dari atas sampai bertemu komentar terbaru yang sudah tercatat.
+    """
+    print(f"\n🔎 Mengambil komentar dari video ID: {video_id}...")
+    entry = state.get(video_id)
+    comments = []
+    skipped_comments = 0
+    total_threads = entry.get('total_threads', 0)
+    newest = entry.get('newest_published')
+    backfill = entry.get('backfill')
+    error = None
+
+    if backfill:
+        part = fetch_comment_pages(youtube, video_id, backfill['page_token'], backfill.get('stop_at'),
+                                   relevant_keywords, backoff, ledger, page_budget)
+        page_budget -= part['pages']
+        comments += part['comments']
+        skipped_comments += part['skipped']
+        total_threads += part['threads']
+        error = part['error']
+        if part['complete']:
+            backfill = None
+        elif error and http_error_reason(error) == 'invalidPageToken':
+            # Token lama kedaluwarsa: ulangi dari atas sampai batas backfill (duplikat dibuang saat disimpan)
+            print(f"   -> 🟡 pageToken lanjutan {video_id} tidak berlaku lagi, backfill diulang dari atas.")
+            newest, backfill = backfill.get('stop_at'), None
+        else:
+            backfill = dict(backfill, page_token=part['next_token'])
+        state.update(video_id, newest_published=newest, total_threads=total_threads, backfill=backfill)
 
-    print(f"   -> Ditemukan {len(comments)} komentar yang relevan.")
+    if not backfill and not error:
+        part = fetch_comment_pages(youtube, video_id, None, newest, relevant_keywords,
+                                   backoff, ledger, page_budget)
+        comments += part['comments']
+        skipped_comments += part['skipped']
+        total_threads += part['threads']
+        error = part['error']
+        if not part['complete'] and part['pages']:
+            # Terputus di tengah: halaman sisanya (sampai batas lama) menjadi backfill run berikutnya
+            backfill = {'page_token': part['next_token'], 'stop_at': newest}
+        if part['newest'] and (not newest or part['newest'] > newest):
+            newest = part['newest']
+        state.update(video_id, newest_published=newest, total_threads=total_threads, backfill=backfill)
+
+    state.update(video_id, last_error=http_error_reason(error) or str(error) if error else None)
+    if error:
+        if http_error_reason(error) == 'commentsDisabled':
+            print(f"   -> 🟡 Peringatan: Komentar dinonaktifkan untuk video {video_id}.")
+        elif http_error_reason(error) != 'invalidPageToken':
+            print(f"   -> 💥 Error saat mengambil komentar {video_id}: {error}")
+
+    status = "masih ada halaman tersisa" if state.has_backlog(video_id) else "sudah mutakhir"
+    print(f"   -> [{video_id}] Ditemukan {len(comments)} komentar baru yang relevan ({status}).")
     if skipped_comments > 0:
-        print(f"   -> Dilewati {skipped_comments} komentar (tidak relevan/spam).")
+        print(f"   -> [{video_id}] Dilewati {skipped_comments} komentar (tidak relevan/spam).")
     return comments
 
+def crawl_videos(api_key: str, video_ids: list, relevant_keywords: set, state: VideoState,
+                 ledger: QuotaLedger, max_workers: int = MAX_CONCURRENT_VIDEOS) -> list:
+    """Ambil komentar semua video secara paralel; total waktu ~ rantai halaman video terpanjang.
+
+    Sisa kuota dibagi rata antar video per putaran, jadi satu video besar tidak menghabiskan
+    kuota video lain. Video yang masih punya halaman tersisa mendapat sisa kuota di putaran berikutnya.
+    """
+    try:
+        youtube = build_youtube_client(api_key)
+    except Exception as e:
+        print(f"❌ Gagal terhubung ke YouTube API: {e}")
+        return []
+
+    backoff = SharedBackoff()
+    all_comments = []
+    pending = list(video_ids)
+    round_no = 1
+    while pending and ledger.remaining() >= COMMENT_THREADS_COST:
+        remaining_before = ledger.remaining()
+        page_budget = max(1, remaining_before // (COMMENT_THREADS_COST * len(pending)))
+        print(f"\n📊 Putaran {round_no}: {len(pending)} video, sisa kuota {remaining_before} unit, "
+              f"maksimal {page_budget} halaman per video.")
+        n_workers = max(1, min(max_workers, len(pending)))
+        with ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="yt") as executor:
+            futures = {executor.submit(get_video_comments, youtube, video_id, relevant_keywords, backoff,
+                                       state, ledger, page_budget): video_id
+                       for video_id in pending}
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Memproses Video"):
+                try:
+                    all_comments.extend(future.result())
+                except Exception as e:
+                    print(f"❌ Gagal memproses video {futures[future]}: {e}")
+        pending = [video_id for video_id in pending if state.can_resume(video_id)]
+        if ledger.remaining() == remaining_before:
+            break
+        round_no += 1
+
+    pending = [video_id for video_id in video_ids if state.has_backlog(video_id)]
+    if pending:
+        print(f"🟡 {len(pending)} video masih punya halaman tersisa; dilanjutkan saat kuota tersedia lagi.")
+    return all_comments
+
 # =================================================
 # SCRIPT UTAMA
 # =================================================
@@ -113,28 +393,42 @@ if __name__ == "__main__":
     start_time = time.time()
     print("🚀 Memulai Proses Crawling Komentar YouTube dengan Filter Relevansi...")
     
-    all_comments_data = []
-    
-    for video_id in tqdm(VIDEO_IDS, desc="Memproses Video"):
-        comments = get_video_comments(YOUTUBE_API_KEY, video_id, RELEVANT_KEYWORDS)
-        all_comments_data.extend(comments)
+    state = VideoState(STATE_PATH)
+    ledger = QuotaLedger(QUOTA_LEDGER_PATH)
+    print(f"Sisa kuota hari ini: {ledger.remaining()} unit.")
     
-    if not all_comments_data:
-        print("\n❌ Tidak ada komentar relevan yang berhasil dikumpulkan.")
-    else:
-        df = pd.DataFrame(all_comments_data)
-        df['tanggal'] = pd.to_datetime(df['tanggal'])
-        df = df.sort_values(by='tanggal', ascending=False)
-        
-        output_dir = os.path.join('data', 'raw')
-        os.makedirs(output_dir, exist_ok=True)
-        filename = f"{NAMA_FILE_OUTPUT}_{datetime.now().strftime('%Y%m%d')}.csv"
-        output_path = os.path.join(output_dir, filename)
-        
-        df.to_csv(output_path, index=False, encoding='utf-8-sig')
+    try:
+        all_comments_data = crawl_videos(YOUTUBE_API_KEY, VIDEO_IDS, RELEVANT_KEYWORDS, state, ledger)
         
-        print(f"\n✅ Selesai! Total {len(df)} komentar relevan dari {len(VIDEO_IDS)} video berhasil dikumpulkan.")
-        print(f"💾 Data telah disimpan di: '{output_path}'")
+        if not all_comments_data:
+            print("\n❌ Tidak ada komentar relevan baru yang berhasil dikumpulkan.")
+        else:
+            df = pd.DataFrame(all_comments_data)
+            
+            output_dir = os.path.join('data', 'raw')
+            os.makedirs(output_dir, exist_ok=True)
+            filename = f"{NAMA_FILE_OUTPUT}_{datetime.now().strftime('%Y%m%d')}.csv"
+            output_path = os.path.join(output_dir, filename)
+            
+            df['tanggal'] = pd.to_datetime(df['tanggal'], utc=True)
+            # Run kedua di hari yang sama hanya membawa komentar baru: gabungkan dengan file hari ini
+            if os.path.exists(output_path):
+                previous = pd.read_csv(output_path, encoding='utf-8-sig')
+                previous['tanggal'] = pd.to_datetime(previous['tanggal'], utc=True, format='ISO8601')
+                df = pd.concat([previous, df], ignore_index=True)
+                # File lama (sebelum ada comment_id) dideduplikasi dengan kolom isi komentar
+                key = ['comment_id'] if 'comment_id' in previous else ['video_id', 'penulis', 'tanggal', 'teks']
+                df = df.drop_duplicates(subset=key, keep='last')  # like_count terbaru yang dipakai
+            df = df.sort_values(by='tanggal', ascending=False)
+            
+            df.to_csv(output_path, index=False, encoding='utf-8-sig')
+            
+            print(f"\n✅ Selesai! {len(all_comments_data)} komentar relevan baru dari {len(VIDEO_IDS)} video dikumpulkan.")
+            print(f"💾 Data telah disimpan di: '{output_path}' ({len(df)} baris)")
+        state.save()
+    finally:
+        ledger.save()
+        print(f"Sisa kuota hari ini: {ledger.remaining()} unit.")
 
     end_time = time.time()
     print(f"⏱️ Total waktu eksekusi: {time.time() - start_time:.2f} detik.")
@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark offline untuk 1_data_crawling.py
+
+Menjalankan jalur crawler yang sebenarnya (scout_with_pygooglenews -> process_articles_batch
+-> deduplicate_results) terhadap server HTTP lokal yang menyajikan feed scout tiruan dan
+korpus halaman artikel tersimpan, dengan latensi, error dan aset lambat yang disuntikkan.
+
+Pemakaian:
+    python src/crawler_benchmark.py                  # semua konfigurasi
+    python src/crawler_benchmark.py baseline flaky   # konfigurasi tertentu
+"""
+
+import os
+import sys
+import time
+import json
+import random
+import logging
+import tempfile
+import threading
+import importlib
+from datetime import datetime
+from email.utils import format_datetime
+from html import escape
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from typing import List, Dict, Tuple, Optional
+
+# --- Log benchmark terpisah; basicConfig di sini membuat crawler tidak menimpa crawler.log ---
+os.makedirs('data/logs', exist_ok=True)
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.FileHandler('data/logs/benchmark.log', mode='w'), logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Diimpor lewat sys.path (bukan dari file langsung) agar proses parser bisa mengimpornya ulang
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+crawler = importlib.import_module('1_data_crawling')
+
+# ==============================================================================
+# --- KONFIGURASI BENCHMARK ---
+BENCH_KEYWORDS = ["nikel raja ampat", "tambang nikel", "raja ampat"]
+BENCH_START_DATE = "2025-05-01"
+BENCH_END_DATE = "2025-07-31"
+BENCH_PAGES = 60  # jumlah halaman korpus (diambil dari HTML cache bila ada, selain itu sintetis)
+BENCH_PORTALS = 8  # jumlah domain portal tiruan; scheduler per-domain memperlakukannya terpisah
+BENCH_SYNDICATED_EVERY = 10  # setiap halaman ke-N adalah salinan halaman lain (uji deduplikasi)
+BENCH_SEED = 42
+BENCH_OUTPUT_DIR = os.path.join('data', 'benchmark')
+
+# latency: (dasar, jitter) detik per halaman; error_rate: peluang 503/429; slow_asset_delay: jeda aset (Selenium)
+BENCHMARK_CONFIGS = [
+    {'name': 'baseline', 'max_workers': 3, 'latency': (0.2, 0.1), 'error_rate': 0.0, 'slow_asset_delay': 0.0},
+    {'name': 'slow', 'max_workers': 3, 'latency': (1.5, 1.0), 'error_rate': 0.0, 'slow_asset_delay': 0.0},
+    {'name': 'slow_more_workers', 'max_workers': 8, 'latency': (1.5, 1.0), 'error_rate': 0.0, 'slow_asset_delay': 0.0},
+    # 503/429 memicu eskalasi ke Selenium; tanpa Chrome halaman tersebut tercatat gagal
+    {'name': 'flaky', 'max_workers': 3, 'latency': (0.3, 0.2), 'error_rate': 0.1, 'slow_asset_delay': 0.0},
+    # Tanpa HTTP-first semua halaman lewat Selenium; butuh Chrome terpasang
+    {'name': 'selenium_slow_assets', 'max_workers': 3, 'latency': (0.3, 0.2), 'error_rate': 0.0,
+     'slow_asset_delay': 3.0, 'http_first': False},
+]
+# ==============================================================================
+
+_WORDS = ("pemerintah tambang nikel raja ampat izin usaha pertambangan pulau gag kawasan konservasi "
+          "masyarakat adat papua barat daya kementerian lingkungan hidup terumbu karang wisata bahari "
+          "investasi hilirisasi smelter ekosistem laut nelayan lokal aktivis greenpeace pencabutan "
+          "evaluasi perusahaan operasi produksi dampak sedimentasi pengawasan regulasi daerah").split()
+
+def synthetic_corpus(count: int, rng: random.Random) -> List[Tuple[str, str]]:
+    """Deterministic (title, body paragraphs) pairs; every BENCH_SYNDICATED_EVERY-th is a syndicated copy."""
+    corpus = []
+    for i in range(count):
+        if i and i % BENCH_SYNDICATED_EVERY == 0:
+            title, paragraphs = corpus[rng.randrange(i)]
+            corpus.append((f"{title} (salinan)", paragraphs))
+            continue
+        title = ' '.join(rng.choice(_WORDS) for _ in range(8)).capitalize()
+        paragraphs = [' '.join(rng.choice(_WORDS) for _ in range(rng.randint(40, 80))).capitalize() + '.'
+                      for _ in range(rng.randint(4, 8))]
+        corpus.append((title, paragraphs))
+    return corpus
+
+def render_page(index: int, title: str, paragraphs: List[str]) -> str:
+    body = '\n'.join(f"<p>{escape(p)}</p>" for p in paragraphs)
+    return f"""<!DOCTYPE html>
+<html lang="id"><head><meta charset="utf-8"><title>{escape(title)}</title>
+<meta property="og:title" content="{escape(title)}">
+<meta property="article:published_time" content="2025-06-{index % 28 + 1:02d}T08:00:00+07:00">
+<link rel="stylesheet" href="/asset/{index}.css"><script src="/asset/{index}.js"></script></head>
+<body><nav><a href="/">Beranda</a> <a href="/nasional">Nasional</a></nav>
+<article><h1>{escape(title)}</h1><div class="byline">Penulis Benchmark</div>
+<img src="/asset/{index}.jpg" alt="">{body}</article>
+<footer>Hak cipta portal tiruan</footer></body></html>"""
+
+def load_corpus(count: int, rng: random.Random) -> List[Tuple[str, str]]:
+    """(title, html) pages: saved pages from the crawler's HTML cache if present, otherwise synthetic."""
+    pages = []
+    if os.path.exists(os.path.join(crawler.HTML_CACHE_DIR, 'index.db')):
+        cache = crawler.HtmlCache(crawler.HTML_CACHE_DIR)
+        for article_info, html in cache.iter_entries():
+            pages.append((article_info.get('title') or f"Artikel {len(pages)}", html))
+            if len(pages) >= count:
+                break
+        cache.close()
+    if pages:
+        logger.info(f"Using {len(pages)} saved pages from {crawler.HTML_CACHE_DIR}")
+        return pages
+    logger.info(f"No saved pages found; generating {count} synthetic pages")
+    return [(title, render_page(i, title, paragraphs))
+            for i, (title, paragraphs) in enumerate(synthetic_corpus(count, rng))]
+
+class FixtureServer:
+    """Local HTTP server for the benchmark: stub Google News RSS search, article pages and slow assets.
+
+    The fault profile (`configure`) can be changed between runs: every article
+    request sleeps for `latency` (base, jitter) seconds and fails with 503/429 at
+    `error_rate`; assets referenced by the pages are held for `slow_asset_delay`.
+    """
+
+    def __init__(self, pages: List[Tuple[str, str]], keywords: List[str], portals: int = BENCH_PORTALS,
+                 seed: int = BENCH_SEED):
+        self.pages = pages
+        self.keywords = keywords
+        self.portals = portals
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.profile = {'latency': (0.0, 0.0), 'error_rate': 0.0, 'slow_asset_delay': 0.0}
+        self.requests = 0
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fixture-server", daemon=True)
+
+    def start(self) -> 'FixtureServer':
+        self._thread.start()
+        return self
+
+    def configure(self, latency: Tuple[float, float], error_rate: float, slow_asset_delay: float):
+        self.profile = {'latency': latency, 'error_rate': error_rate, 'slow_asset_delay': slow_asset_delay}
+        self.requests = 0
+
+    def _random(self) -> float:
+        with self.rng_lock:
+            return self.rng.random()
+
+    def rss(self, query: str) -> bytes:
+        keyword = query.split(' after:')[0]
+        items = []
+        for i, (title, _) in enumerate(self.pages):
+            if self.keywords[i % len(self.keywords)] != keyword:
+                continue
+            portal = i % self.portals
+            items.append(f"""<item><title>{escape(title)}</title><link>{self.base_url}/article/{i}</link>
+<guid>{self.base_url}/article/{i}</guid><pubDate>{format_datetime(datetime(2025, 6, i % 28 + 1, 8))}</pubDate>
+<source url="https://portal{portal}.bench.test">Portal {portal}</source></item>""")
+        return (f"""<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>
+<title>"{escape(query)}" - Google News</title><lastBuildDate>{format_datetime(datetime.now())}</lastBuildDate>
+{''.join(items)}</channel></rss>""").encode('utf-8')
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                with server.rng_lock:
+                    server.requests += 1
+                parsed = urlparse(self.path)
+                profile = server.profile
+                if parsed.path == '/rss/search':
+                    query = parse_qs(parsed.query).get('q', [''])[0]
+                    return self._send(200, server.rss(query), 'application/rss+xml; charset=utf-8')
+                if parsed.path.startswith('/asset/'):
+                    time.sleep(profile['slow_asset_delay'])
+                    return self._send(200, b'/* asset */', 'application/octet-stream')
+                if parsed.path.startswith('/article/'):
+                    base, jitter = profile['latency']
+                    time.sleep(base + jitter * server._random())
+                    if server._random() < profile['error_rate']:
+                        return self._send(503 if server._random() < 0.5 else 429, b'unavailable', 'text/plain')
+                    try:
+                        _, html = server.pages[int(parsed.path.rsplit('/', 1)[1])]
+                    except (ValueError, IndexError):
+                        return self._send(404, b'not found', 'text/plain')
+                    return self._send(200, html.encode('utf-8'), 'text/html; charset=utf-8')
+                self._send(404, b'not found', 'text/plain')
+
+        return Handler
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+class MemorySampler:
+    """Samples RSS of this process and its children (parser processes, Chrome) to find the peak."""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="memory-sampler", daemon=True)
+
+    def _sample(self) -> float:
+        proc = crawler.psutil.Process()
+        total = proc.memory_info().rss
+        for child in proc.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except crawler.psutil.Error:
+                pass
+        return total / (1024 * 1024)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_mb = max(self.peak_mb, self._sample())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> 'MemorySampler':
+        if crawler.psutil is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))], 3)
+
+def timed_tier(func, latencies: List[float]):
+    """Wrap a crawler fetch tier so every call's wall time is recorded."""
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - started)
+    return wrapper
+
+def run_config(server: FixtureServer, config: Dict) -> Dict:
+    """Scout, fetch/parse and deduplicate against the fixture server with one fault profile."""
+    server.configure(config['latency'], config['error_rate'], config['slow_asset_delay'])
+    latencies = []
+    originals = (crawler.fetch_article_with_http, crawler.fetch_article_with_selenium, crawler.ENABLE_HTTP_FIRST)
+    crawler.fetch_article_with_http = timed_tier(originals[0], latencies)
+    crawler.fetch_article_with_selenium = timed_tier(originals[1], latencies)
+    crawler.ENABLE_HTTP_FIRST = config.get('http_first', True)
+    crawler.FETCH_TIER_STATS.clear()
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp, MemorySampler() as memory:
+        crawler.SCOUT_CACHE = crawler.ScoutCache(os.path.join(tmp, 'scout_cache.db'))
+        try:
+            articles = []
+            for keyword in BENCH_KEYWORDS:
+                articles += crawler.scout_with_pygooglenews(keyword, BENCH_START_DATE, BENCH_END_DATE) or []
+            scouted = time.perf_counter()
+            results = crawler.process_articles_batch(articles, max_workers=config['max_workers'])
+            fetched = time.perf_counter()
+            final_results = crawler.deduplicate_results(results)
+            deduplicated = time.perf_counter()
+        finally:
+            crawler.SCOUT_CACHE.close()
+            crawler.SCOUT_CACHE = None
+            (crawler.fetch_article_with_http, crawler.fetch_article_with_selenium,
+             crawler.ENABLE_HTTP_FIRST) = originals
+    elapsed = time.perf_counter() - started
+    return {
+        'name': config['name'],
+        'config': config,
+        'scouted': len(articles),
+        'valid': len(results),
+        'unique': len(final_results),
+        'fetch_tiers': dict(crawler.FETCH_TIER_STATS),
+        'server_requests': server.requests,
+        'elapsed_seconds': round(elapsed, 3),
+        'scout_seconds': round(scouted - started, 3),
+        'fetch_parse_seconds': round(fetched - scouted, 3),
+        'dedup_seconds': round(deduplicated - fetched, 3),
+        'articles_per_minute': round(len(results) / (elapsed / 60), 2) if elapsed else 0.0,
+        'fetch_p50_seconds': percentile(latencies, 0.5),
+        'fetch_p95_seconds': percentile(latencies, 0.95),
+        'peak_rss_mb': round(memory.peak_mb, 1) if crawler.psutil is not None else None,
+    }
+
+def print_report(reports: List[Dict]):
+    print("\n📊 Benchmark crawler (fixture lokal):")
+    print(f"  {'konfigurasi':<22}{'valid':>7}{'unik':>6}{'art/mnt':>9}{'p50 (s)':>9}{'p95 (s)':>9}{'peak MB':>9}")
+    for r in reports:
+        print(f"  {r['name']:<22}{r['valid']:>7}{r['unique']:>6}{r['articles_per_minute']:>9}"
+              f"{str(r['fetch_p50_seconds']):>9}{str(r['fetch_p95_seconds']):>9}{str(r['peak_rss_mb']):>9}")
+
+# =================================================
+# MAIN SCRIPT
+# =================================================
+if __name__ == "__main__":
+    selected = set(sys.argv[1:])
+    configs = [c for c in BENCHMARK_CONFIGS if not selected or c['name'] in selected]
+    if not configs:
+        logger.error(f"Unknown configuration(s): {', '.join(sorted(selected))}")
+        sys.exit(1)
+
+    rng = random.Random(BENCH_SEED)
+    server = FixtureServer(load_corpus(BENCH_PAGES, rng), BENCH_KEYWORDS).start()
+    crawler.GOOGLE_NEWS_RSS_SEARCH = f"{server.base_url}/rss/search?q={{query}}"
+    logger.info(f"Fixture server listening on {server.base_url}")
+
+    reports = []
+    try:
+        for config in configs:
+            logger.info(f"Running benchmark configuration '{config['name']}'...")
+            reports.append(run_config(server, config))
+            logger.info(f"Result: {reports[-1]}")
+    finally:
+        server.close()
+
+    print_report(reports)
+    os.makedirs(BENCH_OUTPUT_DIR, exist_ok=True)
+    output_path = os.path.join(BENCH_OUTPUT_DIR, f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(reports, f, ensure_ascii=False, indent=2)
+    logger.info(f"📁 Benchmark report saved to {output_path}")